@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks of jw.py modes against the fake JIRA server.
+
+Every mode runs in a fresh process with a temporary HOME, once with
+empty metadata cache and once with it warm. Prints one JSON object per
+run with wall time and requests served, e.g.:
+
+    bench/bench_cli.py --issues 5000 --latency 0.02 --output cli.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import fakejira
+
+
+JW = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jw.py")
+
+MODES = [
+    ("summary", []),
+    ("sprints", ["--sprints"]),
+    ("versions", ["--versions"]),
+    ("tasks", ["--tasks"]),
+    ("tasks-of-sprint", ["--tasks", "--for-period", "--of-sprint", "1"]),
+    ("tasks-of-sprint-changed", ["--tasks", "--for-period", "--of-sprint", "1", "--change-status"]),
+    ("tasks-for-sprint", ["--tasks", "--for-sprint", "Sprint 20", "--group-assignee"]),
+    ("tasks-for-version", ["--tasks", "--for-version", "1.9.0", "--group-state"]),
+    ("tasks-state-complete", ["--tasks", "--for-sprint", "Sprint 20", "--state-complete", "--type-bugs"]),
+    ("tasks-list", ["--tasks", "--list", "PRJ-1", "PRJ-2", "PRJ-3", "PRJ-4", "PRJ-5"]),
+    ("tasks-inspect", ["--tasks", "--inspect", "PRJ-1,PRJ-2"]),
+]
+
+CONFIG = """[bench]
+project=PRJ
+board=Bench board
+server=%s
+username=bench
+password=bench
+workers=%i
+page_size=%i
+"""
+
+
+def setup(home, server, args):
+    with open(os.path.join(home, ".jw.conf"), "w") as f:
+        f.write(CONFIG % (server.url, args.workers, args.page_size))
+
+
+def run(home, server, argv):
+    env = dict(os.environ, HOME=home)
+    env.pop("XDG_RUNTIME_DIR", None)
+    server.stats.reset()
+    began = time.perf_counter()
+    # Runs in HOME, so no jw.conf from current directory is picked up
+    proc = subprocess.run([sys.executable, JW, "--no-daemon", "bench"] + argv,
+                          cwd=home, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    took = time.perf_counter() - began
+    return proc, took, server.stats.dump()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='jw.py end-to-end benchmarks')
+    parser.add_argument('--issues', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0, help='per-request latency, seconds')
+    parser.add_argument('--page-limit', type=int, default=100, help='server maximum page size')
+    parser.add_argument('--rate', type=float, default=0, help='server requests per second before 429')
+    parser.add_argument('--workers', type=int, default=4, help='jw.py concurrent requests')
+    parser.add_argument('--page-size', type=int, default=100, help='jw.py issues per request')
+    parser.add_argument('--mode', action='append', dest='modes',
+                        help='run only named mode')
+    parser.add_argument('--output', default='-',
+                        help='JSON lines output file')
+    args = parser.parse_args()
+
+    server = fakejira.start(args.issues, latency=args.latency, page_limit=args.page_limit,
+                            rate=args.rate, history=args.history)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for name, argv in MODES:
+            if args.modes and name not in args.modes:
+                continue
+            home = tempfile.mkdtemp(prefix="jw-bench-")
+            try:
+                setup(home, server, args)
+                for cache in ("cold", "warm"):
+                    proc, took, stats = run(home, server, argv)
+                    if proc.returncode != 0:
+                        sys.stderr.write(proc.stderr.decode(errors="replace"))
+                    out.write(json.dumps({
+                        "mode": name,
+                        "cache": cache,
+                        "issues": args.issues,
+                        "latency": args.latency,
+                        "status": proc.returncode,
+                        "seconds": round(took, 4),
+                        "requests": stats["requests"],
+                        "throttled": stats["throttled"],
+                        "bytes": stats["bytes"],
+                        "output_lines": proc.stdout.count(b"\n"),
+                        "paths": stats["paths"],
+                    }) + "\n")
+                    out.flush()
+            finally:
+                shutil.rmtree(home, ignore_errors=True)
+    finally:
+        server.shutdown()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
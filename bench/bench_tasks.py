@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+In-process benchmarks of the tasks pipeline over synthetic issues.
+
+Prints one JSON object per stage and size, e.g.:
+
+    bench/bench_tasks.py --sizes 1000,10000 --output bench.jsonl
+"""
+
+import os
+import io
+import sys
+import gc
+import json
+import time
+import argparse
+import datetime
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fixtures
+from jw import records as jwrecords
+from jw import properties as jwprops
+from jw import tasks as jwtasks
+from jw import analytics as jwanalytics
+from jw import export as jwexport
+
+
+DATE_FROM = datetime.datetime(2020, 3, 1)
+DATE_TO = datetime.datetime(2020, 9, 1)
+
+
+def build(issues):
+    return [jwrecords.TaskRecord(raw, fixtures.SPRINT_FIELD) for raw in issues]
+
+
+def stages(issues):
+    """
+    Stage name, setup returning stage input and the measured function.
+    """
+    built = []
+
+    def records():
+        # Built once, sprint names stay memoized on them afterwards
+        if not built:
+            built.extend(build(issues))
+        return built
+
+    def fresh():
+        return build(issues)
+
+    def printer():
+        printing = jwtasks.TasksPrinter()
+        printing.default().include('sprint', 'version')
+        return printing
+
+    def print_tasks(tasks):
+        printing = printer()
+        with redirect_stdout(io.StringIO()):
+            printing.write(tasks)
+
+    def export_tasks(fmt):
+        def run(tasks):
+            exporter = jwexport.FORMATS[fmt](io.StringIO(), jwexport.columns())
+            exporter.write(tasks)
+        return run
+
+    def group_tasks(tasks):
+        grouping = jwtasks.TasksGroups()
+        grouping.group(lambda task: jwprops.taskSprints(task, True))
+        grouping.group(lambda task: task.assignee or "Unassigned")
+        grouping.group(lambda task: task.status)
+        grouping.print(lambda task: None)
+        grouping.digest(tasks)
+
+    filtering = [[('type', 'Bug'), ('state', 'Working')], [('state', 'Incomplete')]]
+
+    return [
+        ("records", lambda: issues, build),
+        ("FilterChangedStatus", records,
+         lambda tasks: jwtasks.FilterChangedStatus(DATE_FROM, DATE_TO).digest(tasks)),
+        ("FilterChangedResolution", records,
+         lambda tasks: jwtasks.FilterChangedResolution(DATE_FROM, DATE_TO).digest(tasks)),
+        ("TasksFilter", records,
+         lambda tasks: jwtasks.TasksFilter().parse(filtering).digest(tasks)),
+        ("TasksGroups", records, group_tasks),
+        ("TasksPrinter", records, print_tasks),
+        ("taskSprints", fresh,
+         lambda tasks: [jwprops.taskSprints(task, True) for task in tasks]),
+        ("taskVersions", records,
+         lambda tasks: [jwprops.taskVersions(task, True) for task in tasks]),
+        ("export-jsonl", records, export_tasks('jsonl')),
+        ("export-csv", records, export_tasks('csv')),
+        ("Throughput", records,
+         lambda tasks: jwanalytics.Throughput(DATE_FROM, DATE_TO).digest(tasks, lambda task: task.type)),
+        ("CycleTime", records,
+         lambda tasks: jwanalytics.CycleTime(DATE_TO).digest(tasks, lambda task: task.type)),
+    ]
+
+
+def measure(setupFn, runFn, repeat):
+    best = None
+    for i in range(repeat):
+        data = setupFn()
+        gc.collect()
+        began = time.perf_counter()
+        runFn(data)
+        took = time.perf_counter() - began
+        best = took if best is None else min(best, took)
+
+    # Separate pass, tracing slows the stage down
+    data = setupFn()
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    runFn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tasks pipeline benchmarks')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='comma separated issue counts')
+    parser.add_argument('--history', type=int, default=8,
+                        help='changelog records per issue')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per stage, best is reported')
+    parser.add_argument('--stage', action='append', dest='stages',
+                        help='run only named stage')
+    parser.add_argument('--output', default='-',
+                        help='JSON lines output file')
+    args = parser.parse_args()
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    for size in [int(size) for size in args.sizes.split(',')]:
+        issues = fixtures.issues(size, history=args.history)
+        for name, setupFn, runFn in stages(issues):
+            if args.stages and name not in args.stages:
+                continue
+            took, peak = measure(setupFn, runFn, args.repeat)
+            out.write(json.dumps({
+                "stage": name,
+                "size": size,
+                "history": args.history,
+                "seconds": round(took, 6),
+                "per_task_us": round(took / size * 1e6, 3),
+                "peak_bytes": peak,
+            }) + "\n")
+            out.flush()
+
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Fake JIRA REST server over generated fixtures, with configurable
+per-request latency, page size limit and 429 throttling. Searches
+evaluate the JQL subset jw.py sends and answer 400 to anything else:
+
+    bench/fakejira.py --port 8080 --issues 5000 --latency 0.05
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import datetime
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import fixtures
+
+
+class Stats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.throttled = 0
+        self.bytes = 0
+        self.paths = {}
+
+    def add(self, path, size, throttled=False):
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+            if throttled:
+                self.throttled += 1
+            self.paths[path] = self.paths.get(path, 0) + 1
+
+    def dump(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "bytes": self.bytes,
+                "paths": dict(self.paths),
+            }
+
+
+class Throttle:
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.tokens = rate
+        self.stamp = time.monotonic()
+
+    def take(self):
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def parse_date(value):
+    return datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+
+class JQLError(ValueError):
+    pass
+
+
+TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*")|(!=|>=|<=|=|>|<|\(|\)|,)|([\w.\-\[\]]+))')
+
+DATES = {"updated": "updated", "created": "created", "resolved": "resolutiondate"}
+
+COMPARE = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+}
+
+
+def _tokens(jql):
+    tokens = []
+    pos = 0
+    jql = jql.strip()
+    while pos < len(jql):
+        match = TOKEN.match(jql, pos)
+        if not match or match.end() == pos:
+            raise JQLError("Unexpected JQL at '%s'" % jql[pos:])
+        quoted, op, word = match.groups()
+        if quoted:
+            tokens.append(("value", quoted[1:-1].replace('\\"', '"')))
+        elif op:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("word", word))
+        pos = match.end()
+    return tokens
+
+
+def _minute(value):
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except ValueError:
+        raise JQLError("Unsupported date '%s'" % value)
+
+
+class Query:
+    """
+    Evaluates the JQL subset jw.py sends: AND/OR of field comparisons,
+    'key in (...)' and 'CHANGED' predicates. Anything else is rejected,
+    so benchmarks never run against a silently different workload.
+    """
+
+    def __init__(self, jql, data):
+        self.data = data
+        self.tokens = _tokens(jql)
+        self.pos = 0
+        if not self.tokens:
+            self.match = lambda issue: True
+            return
+        self.match = self.expr()
+        if self.pos < len(self.tokens):
+            raise JQLError("Unexpected JQL '%s'" % self.tokens[self.pos][1])
+
+    def peek(self, kind=None, text=None):
+        if self.pos >= len(self.tokens):
+            return None
+        token = self.tokens[self.pos]
+        if kind and token[0] != kind:
+            return None
+        if text and token[1].upper() != text.upper():
+            return None
+        return token
+
+    def take(self, kind=None, text=None):
+        token = self.peek(kind, text)
+        if token is None:
+            raise JQLError("Expected %s in JQL" % (text or kind))
+        self.pos += 1
+        return token[1]
+
+    def value(self):
+        token = self.peek()
+        if token is None or token[0] == "op":
+            raise JQLError("Expected value in JQL")
+        self.pos += 1
+        return token[1]
+
+    def expr(self):
+        terms = [self.term()]
+        while self.peek("word", "OR"):
+            self.pos += 1
+            terms.append(self.term())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda issue: any(term(issue) for term in terms)
+
+    def term(self):
+        factors = [self.factor()]
+        while self.peek("word", "AND"):
+            self.pos += 1
+            factors.append(self.factor())
+        if len(factors) == 1:
+            return factors[0]
+        return lambda issue: all(factor(issue) for factor in factors)
+
+    def factor(self):
+        if self.peek("op", "("):
+            self.pos += 1
+            match = self.expr()
+            self.take("op", ")")
+            return match
+        return self.clause()
+
+    def clause(self):
+        field = self.take("word")
+        name = field.lower()
+
+        if self.peek("word", "CHANGED"):
+            self.pos += 1
+            return self.changed(field)
+
+        if self.peek("word", "in"):
+            self.pos += 1
+            if name != "key":
+                raise JQLError("Unsupported JQL field '%s' for in" % field)
+            self.take("op", "(")
+            keys = [self.value()]
+            while self.peek("op", ","):
+                self.pos += 1
+                keys.append(self.value())
+            self.take("op", ")")
+            wanted = set(issue["key"] for issue in map(self.data.issue, keys) if issue)
+            return lambda issue: issue["key"] in wanted
+
+        op = self.take("op")
+        if op not in COMPARE:
+            raise JQLError("Unsupported JQL operator '%s'" % op)
+        compare = COMPARE[op]
+        value = self.value()
+
+        if name in DATES:
+            limit = _minute(value)
+            date = DATES[name]
+
+            def match(issue):
+                stamp = issue["fields"].get(date)
+                return bool(stamp) and compare(parse_date(stamp), limit)
+            return match
+
+        if op not in ("=", "!="):
+            raise JQLError("Unsupported JQL operator '%s' for %s" % (op, field))
+        if name == "project":
+            return lambda issue: compare(issue["fields"]["project"]["key"], value)
+        if name == "key":
+            return lambda issue: compare(issue["key"], value)
+        if name == "issuetype":
+            return lambda issue: compare(issue["fields"]["issuetype"]["name"], value)
+        if name == "status":
+            return lambda issue: compare(issue["fields"]["status"]["name"], value)
+        if name == "fixversion":
+            return lambda issue: compare(value in [v["name"] for v in issue["fields"]["fixVersions"]], True)
+        if name == "sprint":
+            mark = "name=%s," % value
+            return lambda issue: compare(any(mark in s for s in issue["fields"][fixtures.SPRINT_FIELD] or []), True)
+        raise JQLError("Unsupported JQL field '%s'" % field)
+
+    def changed(self, field):
+        dateFrom, dateTo = None, None
+        if self.peek("word", "DURING"):
+            self.pos += 1
+            self.take("op", "(")
+            dateFrom = _minute(self.value())
+            self.take("op", ",")
+            dateTo = _minute(self.value())
+            self.take("op", ")")
+        elif self.peek("word", "AFTER"):
+            self.pos += 1
+            dateFrom = _minute(self.value())
+        elif self.peek("word", "BEFORE"):
+            self.pos += 1
+            dateTo = _minute(self.value())
+
+        def match(issue):
+            for history in issue["changelog"]["histories"]:
+                # Bounds are taken to the minute
+                created = parse_date(history["created"]).replace(second=0)
+                if dateFrom and created < dateFrom or dateTo and created > dateTo:
+                    continue
+                if any(item["field"] == field for item in history["items"]):
+                    return True
+            return False
+        return match
+
+
+class Dataset:
+
+    def __init__(self, count, project="PRJ", history=8, seed=1):
+        self.project = project
+        self.sprints = fixtures.sprints()
+        self.versions = fixtures.versions()
+        self.issues = fixtures.issues(count, project, history, seed)
+        self.bykey = {issue["key"]: issue for issue in self.issues}
+
+    def issue(self, key):
+        # OLD-n keys stand for issues moved into the project since
+        return self.bykey.get(re.sub(r"^OLD-", self.project + "-", key))
+
+    def search(self, jql):
+        """
+        Issues matching jql, JQLError for JQL that can not be evaluated.
+        """
+        match = Query(jql, self).match
+        return [issue for issue in self.issues if match(issue)]
+
+
+def project(issue, fields, expand):
+    out = {"id": issue["id"], "key": issue["key"], "self": issue["self"]}
+    if not fields or "*all" in fields or "*navigable" in fields:
+        out["fields"] = issue["fields"]
+    else:
+        out["fields"] = {k: v for k, v in issue["fields"].items() if k in fields}
+    if expand and "changelog" in expand:
+        out["changelog"] = issue["changelog"]
+    return out
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats.add(urlparse(self.path).path, len(body), code == 429)
+
+    def page(self, items, query):
+        startAt = int(query.get("startAt", ["0"])[0])
+        maxResults = int(query.get("maxResults", ["50"])[0])
+        maxResults = min(maxResults, self.server.page_limit)
+        values = items[startAt:startAt + maxResults]
+        return {
+            "startAt": startAt,
+            "maxResults": maxResults,
+            "total": len(items),
+            "isLast": startAt + len(values) >= len(items),
+            "values": values,
+        }
+
+    def do_POST(self):
+        self.do_GET()
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not self.server.throttle.take():
+            return self.reply(429, {"errorMessages": ["Rate limit exceeded"]},
+                              {"Retry-After": "1", "X-RateLimit-Remaining": "0"})
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/")
+        data = self.server.data
+
+        if path.endswith("/rest/api/2/serverInfo"):
+            return self.reply(200, {"baseUrl": "http://localhost", "version": "8.20.0",
+                                    "versionNumbers": [8, 20, 0], "deploymentType": "Server"})
+        if path.endswith("/rest/api/2/myself") or path.endswith("/rest/auth/1/session"):
+            return self.reply(200, {"name": "bench", "displayName": "Bench", "timeZone": "UTC"})
+        if path.endswith("/rest/api/2/field"):
+            return self.reply(200, [
+                {"id": "summary", "name": "Summary", "custom": False, "clauseNames": ["summary"]},
+                {"id": fixtures.SPRINT_FIELD, "name": "Sprint", "custom": True,
+                 "clauseNames": ["cf[10020]", "Sprint"],
+                 "schema": {"type": "array", "items": "string",
+                            "custom": "com.pyxis.greenhopper.jira:gh-sprint", "customId": 10020}},
+            ])
+        if path.endswith("/rest/api/2/project"):
+            return self.reply(200, [{"id": "1", "key": data.project, "name": "Bench project"}])
+        match = re.search(r"/rest/api/2/project/([^/]+)/versions$", path)
+        if match:
+            return self.reply(200, data.versions)
+        if path.endswith("/rest/agile/1.0/board"):
+            return self.reply(200, self.page([{"id": 1, "name": "Bench board", "type": "scrum"}], query))
+        match = re.search(r"/rest/agile/1.0/board/(\d+)/sprint$", path)
+        if match:
+            return self.reply(200, self.page(data.sprints, query))
+        match = re.search(r"/rest/api/2/issue/([^/]+)$", path)
+        if match:
+            issue = data.issue(match.group(1))
+            if not issue:
+                return self.reply(404, {"errorMessages": ["Issue does not exist"]})
+            return self.reply(200, project(issue, None, query.get("expand", [""])[0]))
+        if path.endswith("/rest/api/2/search"):
+            body = {}
+            if self.command == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+            jql = query.get("jql", [body.get("jql", "")])[0]
+            fields = ",".join(query.get("fields", [])).split(",") if "fields" in query else None
+            expand = query.get("expand", [""])[0]
+            try:
+                issues = data.search(jql)
+            except JQLError as e:
+                return self.reply(400, {"errorMessages": [str(e)], "errors": {}})
+            startAt = int(query.get("startAt", ["0"])[0])
+            maxResults = min(int(query.get("maxResults", ["50"])[0]), self.server.page_limit)
+            return self.reply(200, {
+                "startAt": startAt,
+                "maxResults": maxResults,
+                "total": len(issues),
+                "issues": [project(issue, fields, expand) for issue in issues[startAt:startAt + maxResults]],
+            })
+
+        return self.reply(404, {"errorMessages": ["Unknown path %s" % path]})
+
+
+class Server(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address, data, latency=0, page_limit=100, rate=0):
+        super().__init__(address, Handler)
+        self.data = data
+        self.latency = latency
+        self.page_limit = page_limit
+        self.throttle = Throttle(rate)
+        self.stats = Stats()
+
+    @property
+    def url(self):
+        return "http://%s:%i/" % self.server_address
+
+
+def start(count=1000, latency=0, page_limit=100, rate=0, history=8, port=0):
+    server = Server(("127.0.0.1", port), Dataset(count, history=history),
+                    latency=latency, page_limit=page_limit, rate=rate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake JIRA REST server')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--issues', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0, help='per-request latency, seconds')
+    parser.add_argument('--page-limit', type=int, default=100, help='maximum page size')
+    parser.add_argument('--rate', type=float, default=0, help='requests per second before 429')
+    args = parser.parse_args()
+
+    server = Server(("127.0.0.1", args.port), Dataset(args.issues, history=args.history),
+                    latency=args.latency, page_limit=args.page_limit, rate=args.rate)
+    print("Serving %u issues on %s" % (args.issues, server.url), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+
+import random
+import datetime
+
+
+SPRINT_FIELD = "customfield_10020"
+
+TYPES = ["Bug", "Support Task", "Technical Story", "User Story", "Epic"]
+STATES = ["Open", "To Do", "In Progress", "In Review", "Paused", "Resolved", "Done", "Closed"]
+PEOPLE = ["Ann Smith", "Bob Brown", "Carl Green", "Dana White", "Eve Black", "Fred Stone"]
+FLOW = ["Open", "In Progress", "In Review", "Resolved", "Closed"]
+
+
+def jira_date(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def sprints(count=20, start=None, days=14):
+    start = start or datetime.datetime(2020, 1, 6)
+    items = []
+    for i in range(count):
+        dateFrom = start + datetime.timedelta(days=i * days)
+        dateTo = dateFrom + datetime.timedelta(days=days)
+        items.append({
+            "id": i + 1,
+            "name": "Sprint %i" % (i + 1),
+            "state": "closed",
+            "originBoardId": 1,
+            "startDate": jira_date(dateFrom),
+            "endDate": jira_date(dateTo),
+            "completeDate": jira_date(dateTo),
+        })
+    return items
+
+
+def versions(count=10, start=None, days=28):
+    start = start or datetime.datetime(2020, 1, 6)
+    items = []
+    for i in range(count):
+        dateFrom = start + datetime.timedelta(days=i * days)
+        dateTo = dateFrom + datetime.timedelta(days=days)
+        items.append({
+            "id": str(i + 1),
+            "name": "1.%i.0" % i,
+            "description": "Release 1.%i" % i,
+            "archived": False,
+            "released": i < count - 2,
+            "startDate": dateFrom.strftime("%Y-%m-%d"),
+            "releaseDate": dateTo.strftime("%Y-%m-%d"),
+        })
+    return items
+
+
+def sprint_string(sprint):
+    return ("com.atlassian.greenhopper.service.sprint.Sprint@%x[id=%i,rapidViewId=1,"
+            "state=CLOSED,name=%s,startDate=%s,endDate=%s,completeDate=%s,sequence=%i]" %
+            (sprint["id"] * 7919, sprint["id"], sprint["name"], sprint["startDate"],
+             sprint["endDate"], sprint["completeDate"], sprint["id"]))
+
+
+def issue(index, project="PRJ", history=8, sprint_list=None, version_list=None, rnd=random):
+    sprint_list = sprint_list or []
+    version_list = version_list or []
+
+    created = datetime.datetime(2020, 1, 6) + datetime.timedelta(minutes=rnd.randrange(0, 60 * 24 * 280))
+    when = created
+    histories = []
+    state = FLOW[0]
+    resolved = None
+    for n in range(history):
+        when = when + datetime.timedelta(minutes=rnd.randrange(10, 60 * 24 * 3))
+        items = []
+        step = FLOW.index(state) + 1 if state in FLOW else 1
+        if step < len(FLOW) and rnd.random() < 0.6:
+            items.append({"field": "status", "fieldtype": "jira",
+                          "from": str(step), "fromString": state,
+                          "to": str(step + 1), "toString": FLOW[step]})
+            state = FLOW[step]
+            if state == "Resolved":
+                resolved = when
+                items.append({"field": "resolution", "fieldtype": "jira",
+                              "from": None, "fromString": None,
+                              "to": "1", "toString": "Done"})
+        else:
+            items.append({"field": rnd.choice(["assignee", "summary", "description", "labels"]),
+                          "fieldtype": "jira", "from": None, "fromString": "a", "to": None, "toString": "b"})
+        histories.append({
+            "id": str(index * 100 + n),
+            "author": {"displayName": rnd.choice(PEOPLE)},
+            "created": jira_date(when),
+            "items": items,
+        })
+
+    fields = {
+        "summary": "Synthetic issue number %i with a reasonably long summary line" % index,
+        "description": "Lorem ipsum dolor sit amet. " * 20,
+        "issuetype": {"name": rnd.choice(TYPES)},
+        "status": {"name": state if rnd.random() < 0.8 else rnd.choice(STATES)},
+        "assignee": {"displayName": rnd.choice(PEOPLE)} if rnd.random() < 0.9 else None,
+        "reporter": {"displayName": rnd.choice(PEOPLE)},
+        "project": {"key": project},
+        "fixVersions": [{"name": v["name"]} for v in rnd.sample(version_list, min(len(version_list), rnd.choice([0, 1, 1, 2])))],
+        SPRINT_FIELD: [sprint_string(s) for s in rnd.sample(sprint_list, min(len(sprint_list), rnd.choice([0, 1, 1, 2])))] or None,
+        "created": jira_date(created),
+        "updated": jira_date(when),
+        "resolutiondate": jira_date(resolved) if resolved else None,
+        "labels": ["bench"],
+        "attachment": [],
+        "comment": {"comments": [], "total": 0},
+    }
+
+    return {
+        "id": str(10000 + index),
+        "key": "%s-%i" % (project, index + 1),
+        "self": "http://localhost/rest/api/2/issue/%i" % (10000 + index),
+        "fields": fields,
+        "changelog": {"startAt": 0, "maxResults": len(histories), "total": len(histories), "histories": histories},
+    }
+
+
+def issues(count, project="PRJ", history=8, seed=1):
+    rnd = random.Random(seed)
+    sprint_list = sprints()
+    version_list = versions()
+    return [issue(i, project, history, sprint_list, version_list, rnd) for i in range(count)]
@@ -2,120 +2,51 @@
 
 import re
 import sys
-import math
 import datetime
 
+from jw import timing as jwtiming
+from jw import log as jwlog
+from jw import dates as jwdates
 from jw import options as jwoptions
 from jw import config as jwconfig
 from jw import fetch as jwfetch
 from jw import properties as jwprops
-from jw import summary as jwsummary
-from jw import versions as jwversions
-from jw import sprints as jwsprints
 from jw import tasks as jwtasks
 
+jwtiming.mark("imports")
+
 
 def die(msg):
-    print(msg)
+    jwlog.info("%s", msg)
     sys.exit(1)
 
 
-def year_week(dt):
-    dcurrent = dt.date()
-    dfirst = dcurrent.replace(month = 1, day = 1)
-    drange = dcurrent - dfirst
-    return math.floor(drange.days / 7)
-
-
 def jw_version_by_name(version_name):
-    versions = jwfetch.jw_versions()
-    for version in versions:
-        if version.name.find(version_name) == -1:
-            continue
-        return version
-
-    die("Version not found: %s" % version_name)
+    version = jwfetch.jw_version_timeline().named(version_name)
+    if version is None:
+        die("Version not found: %s" % version_name)
+    return version
 
 
 def jw_sprint_by_name(sprint_name):
-    sprints = jwfetch.jw_sprints()
-    for sprint in sprints:
-        if sprint.name.find(sprint_name) == -1:
-            continue
-        return sprint
-
-    die("Sprint not found: %s" % sprint_name)
+    sprint = jwfetch.jw_sprint_timeline().named(sprint_name)
+    if sprint is None:
+        die("Sprint not found: %s" % sprint_name)
+    return sprint
 
 
 def jw_sprint_by_relevance(sprint_offset):
     dateNow = datetime.datetime.now().replace(tzinfo=None)
-    sprint_number = -1
-    sprints = jwfetch.jw_sprints()
-    # Assumes sprints are sorted timewise.
-    for sprint in sprints:
-        sprint_number += 1
-        if sprint.dateFrom and sprint.dateFrom > dateNow:
-            continue
-        elif sprint.dateTo and sprint.dateTo < dateNow:
-            continue
-
-        break
-
-    sprint_number += sprint_offset
-    if sprint_number > len(sprints):
-        return sprints[len(sprints)-1]
-    elif sprint_number < 0:
-        return sprints[0]
-    else:
-        return sprints[sprint_number]
-
-
-def jw_date_by_relevance(date_range):
-    date_offset, sep, date_period = date_range.partition(':')
-    try:
-        period = int(date_period) if date_period else 1
-    except ValueError:
-        period = 1
-
-    match = re.match("(\-?\d+)([hdw])", date_offset)
-    if not match:
-        return None, None
-
-    count = match.group(1)
-    scale = match.group(2)
-    dnow = datetime.datetime.now().replace(tzinfo=None)
-    if scale == "h":
-        dnew = dnow + datetime.timedelta(hours=int(count))
-        if date_period:
-            dnow = dnew + datetime.timedelta(hours=int(period))
-    elif scale == "d":
-        dnow = dnow.replace(hour=0, minute=0, second=0, microsecond=0)
-        dnew = dnow + datetime.timedelta(days=int(count))
-        if date_period:
-            dnow = dnew + datetime.timedelta(days=int(period))
-    elif scale == "w":
-        dnow = dnow.replace(hour=0, minute=0, second=0, microsecond=0)
-        dnow = dnow - datetime.timedelta(days=dnow.weekday())
-        dnew = dnow + datetime.timedelta(weeks=int(count))
-        if date_period:
-            dnow = dnew + datetime.timedelta(weeks=int(period))
-
-    if dnow > dnew:
-        dfrom = dnew
-        dto = dnow
-    else:
-        dfrom = dnow
-        dto = dnew
-
-    return dfrom, dto
+    sprint = jwfetch.jw_sprint_timeline().relative(sprint_offset, dateNow)
+    if sprint is None:
+        die("Sprints not found")
+    return sprint
 
 
 def _jw_group_tasks_by_assignee(tasks):
     groups = {}
     for task in tasks:
-        assignee = "Unassigned"
-        if task.fields.assignee:
-            assignee = task.fields.assignee.displayName
+        assignee = task.assignee or "Unassigned"
 
         if assignee not in groups:
             groups[assignee] = []
@@ -127,17 +58,19 @@ def _jw_group_tasks_by_assignee(tasks):
 
 def _jw_task_property_getter(name):
     if name == 'type':
-        return lambda task: task.fields.issuetype.name
+        return lambda task: task.type
     elif name == 'state':
-        return lambda task: task.fields.status.name
+        return lambda task: task.status
     elif name == 'assignee':
-        return lambda task: task.fields.assignee.displayName
+        return lambda task: task.assignee or "Unassigned"
     elif name == 'reporter':
-        return lambda task: task.fields.reporter.displayName
+        return lambda task: task.reporter or "None"
     elif name == 'sprint':
         return lambda task: jwprops.taskSprints(task, True)
     elif name == 'version':
         return lambda task: jwprops.taskVersions(task, True)
+    elif name == 'target':
+        return lambda task: task.target
     else:
         raise "Unknown property name " + name
 
@@ -176,107 +109,373 @@ def _jw_task_version(name, task):
         p1, s, p2 = name.partition('-')
         return p1[:14]
 
-def jw_run():
-    params = jwoptions.parse()
-    config = jwconfig.get(params.project)
+def _jw_task_fields(params):
+    if params.showCycleTime:
+        props = ['status', 'created', 'resolutiondate']
+    elif params.taskFormat and not params.taskPrint:
+        from jw import export as jwexport
+        props = jwexport.columns()
+    elif params.showSummary:
+        props = ['key']
+    elif params.taskPrint:
+        props = list(params.taskPrint)
+    else:
+        props = list(jwtasks.TasksPrinter().default().columns)
 
-    jwfetch.jw_init(config, params)
+    props.extend(params.taskGroup or [])
+    return jwfetch.jw_task_fields(props)
 
-    if params.showTasks:
-        if params.showInspect:
-            if params.showInspect == True:
-                task = jwfetch.jw_tasks_by_precedence(1)[0]
-            else:
-                task = jwfetch.jw_tasks_by_key(params.showInspect)
-            jwtasks.debug(task)
-            return
 
-        if params.lookupVersion:
-            version = jw_version_by_name(params.lookupVersion)
-            tasks = jwfetch.jw_tasks_by_version(version.name, params)
-            print("Tasks version: %s" % version.name)
-        elif params.lookupSprint:
-            sprint = jw_sprint_by_name(params.lookupSprint)
-            tasks = jwfetch.jw_tasks_by_sprint(sprint.name, params)
-            print("Tasks sprint: %s" % sprint.name)
-        elif params.lookupPeriod:
-            if params.findVersion:
-                version = jw_version_by_name(params.findVersion)
-                dateFrom, dateTo = version.dateFrom, version.dateTo
-            elif params.findSprint:
-                sprint = jw_sprint_by_name(params.findSprint)
-                dateFrom, dateTo = sprint.dateFrom, sprint.dateDone or sprint.dateTo
-            elif params.relSprint != None:
-                sprint = jw_sprint_by_relevance(params.relSprint)
-                dateFrom, dateTo = sprint.dateFrom, sprint.dateDone or sprint.dateTo
-            elif params.relDate != None:
-                dateFrom, dateTo = jw_date_by_relevance(params.relDate)
-            else:
-                dateFrom, dateTo = jw_date_by_relevance('-24h')
-
-            print("Tasks week: %i - %i" % (year_week(dateFrom), year_week(dateTo),))
-            print("Tasks date: %s - %s" % (dateFrom.strftime("%Y-%m-%d"), dateTo.strftime("%Y-%m-%d"),))
-
-            tasks = jwfetch.jw_tasks_by_date(params.findState, dateFrom, dateTo, params)
-        elif params.lookupList:
-            tasks = []
-            for item in params.lookupList:
-                tasks.append(jwfetch.jw_tasks_by_key(item))
+def jw_run():
+    params = jwoptions.parse()
+    jwtiming.setup(params)
+    jwtiming.mark("options")
+
+    if params.daemonServe:
+        from jw import daemon as jwdaemon
+        jwdaemon.serve(jw_main)
+        jwtiming.enabled = False
+        return
+    elif not params.daemonSkip:
+        from jw import daemon as jwdaemon
+        code = jwdaemon.forward(params)
+        if code is not None:
+            jwtiming.enabled = False
+            sys.exit(code)
+
+    with jwtiming.profiled(params.profileDump):
+        jw_main(params)
+
+
+def jw_tasks_period(params):
+    if params.findVersion:
+        version = jw_version_by_name(params.findVersion)
+        dateFrom, dateTo = version.dateFrom, version.dateTo
+    elif params.findSprint:
+        sprint = jw_sprint_by_name(params.findSprint)
+        dateFrom, dateTo = sprint.dateFrom, sprint.dateDone or sprint.dateTo
+    elif params.relSprint != None:
+        sprint = jw_sprint_by_relevance(params.relSprint)
+        dateFrom, dateTo = sprint.dateFrom, sprint.dateDone or sprint.dateTo
+    elif params.relDate != None:
+        dateFrom, dateTo = jwdates.date_by_relevance(params.relDate)
+    else:
+        dateFrom, dateTo = jwdates.date_by_relevance('-24h')
+
+    jwlog.info("Tasks week: %i - %i", jwdates.year_week(dateFrom), jwdates.year_week(dateTo))
+    jwlog.info("Tasks date: %s - %s", dateFrom.strftime("%Y-%m-%d"), dateTo.strftime("%Y-%m-%d"))
+
+    return dateFrom, dateTo
+
+
+def jw_tasks_lookup(params):
+    """
+    Tasks of the current target, with dates of the looked up period.
+    Returns None when there is nothing more to show.
+    """
+    # Request only the fields shown or grouped by
+    params.taskFields = None if params.showInspect else _jw_task_fields(params)
+    # Grouping needs all tasks at hand, unless only aggregated
+    params.taskStream = params.taskStream and (not params.taskGroup or params.showCycleTime)
+    # Exported rows are never grouped
+    if params.taskFormat and not params.taskMerge:
+        params.taskStream = True
+
+    dateFrom, dateTo = None, None
+
+    if params.showInspect:
+        if params.showInspect == True:
+            # Streamed when exporting, take whatever comes first
+            task = next(iter(jwfetch.jw_tasks_by_precedence(1, params)), None)
+            if task is None:
+                print("Tasks not found")
+                return None
+            keys = [task.key]
         else:
-            tasks = jwfetch.jw_tasks_by_precedence(params.lookupLimit, params)
+            keys = params.showInspect.split(',')
+        issues, missing = jwfetch.jw_issues_by_keys(keys)
+        for key in missing:
+            jwlog.warn("Task not found: %s", key)
+        for issue in issues:
+            jwtasks.debug(issue)
+        return None
+
+    if params.lookupVersion:
+        version = jw_version_by_name(params.lookupVersion)
+        tasks = jwfetch.jw_tasks_by_version(version.name, params)
+        jwlog.info("Tasks version: %s", version.name)
+    elif params.lookupSprint:
+        sprint = jw_sprint_by_name(params.lookupSprint)
+        tasks = jwfetch.jw_tasks_by_sprint(sprint.name, params)
+        jwlog.info("Tasks sprint: %s", sprint.name)
+    elif params.lookupPeriod:
+        dateFrom, dateTo = jw_tasks_period(params)
+        tasks = jwfetch.jw_tasks_by_date(params.findState, dateFrom, dateTo, params)
+    elif params.lookupList:
+        tasks, missing = jwfetch.jw_tasks_by_keys(params.lookupList, params)
+        for key in missing:
+            jwlog.warn("Task not found: %s", key)
+    else:
+        tasks = jwfetch.jw_tasks_by_precedence(params.lookupLimit, params)
 
-        if len(tasks) == 0:
-            print("Tasks not found")
-            return
+    return tasks, dateFrom, dateTo
 
-        tasks_total = len(tasks)
 
-        # Apply filtering
+def jw_tasks_changed(params, tasks, dateFrom, dateTo):
+    # Apply filtering, unless already done by server
+    if params.lookupList or not jwfetch.jw_changed_pushdown():
         if params.taskChangeStatus:
-            tasks = jwtasks.FilterChangedStatus(dateFrom, dateTo).digest(tasks)
+            tasks = jwtasks.FilterChangedStatus(dateFrom, dateTo).iterate(tasks)
         if params.taskChangeResolution:
-            tasks = jwtasks.FilterChangedResolution(dateFrom, dateTo).digest(tasks)
+            tasks = jwtasks.FilterChangedResolution(dateFrom, dateTo).iterate(tasks)
+    return tasks
+
+
+def jw_tasks_export(params, tasks, tasks_total):
+    from jw import export as jwexport
+
+    try:
+        exporter = jwexport.writer(params.taskFormat, params.taskPrint, params.taskOutput)
+    except ImportError as e:
+        die("Format %s needs %s installed" % (params.taskFormat, e.name))
+    with jwtiming.phase("export"):
+        count = exporter.write(tasks)
+        exporter.close()
+
+    if params.taskStream:
+        tasks_total = tasks_total.count
+    jwlog.info("Tasks total: %u/%u", count, tasks_total)
+
+
+def jw_tasks_show(params, tasks, tasks_total):
+    if params.taskFormat:
+        jw_tasks_export(params, tasks, tasks_total)
+        return
 
+    if params.taskStream:
+        tasks = tasks_shown = jwtasks.TasksCounter(tasks)
+    else:
+        with jwtiming.phase("filter"):
+            tasks = list(tasks)
         tasks_shown = len(tasks)
         print("Tasks total: %u/%u" % (tasks_shown, tasks_total,))
 
-        if params.showSummary:
-            printing = jwtasks.TasksStream()
-            heading = jwtasks.TasksInline()
+    if params.showSummary:
+        printing = jwtasks.TasksStream()
+        heading = jwtasks.TasksInline()
+    else:
+        # Streamed rows are written as pages come, not held for a chunk
+        printing = jwtasks.TasksPrinter(jwfetch.jw_page_size() if params.taskStream else jwtasks.CHUNK)
+        heading = None
+        if params.showBrief:
+            printing.mapping('type', _jw_task_type, "%-10s")
+            printing.mapping('state', _jw_task_state, "%-12s")
+            printing.mapping('assignee', _jw_task_person, "%-10s")
+            printing.mapping('reporter', _jw_task_person, "%-10s")
+            printing.mapping('sprint', _jw_task_sprint, "%-10s")
+            printing.mapping('version', _jw_task_version, "%-15s")
+
+        if not params.taskPrint:
+            printing.default()
         else:
-            printing = jwtasks.TasksPrinter()
-            heading = None
-            if params.showBrief:
-                printing.mapping('type', _jw_task_type, "%-10s")
-                printing.mapping('state', _jw_task_state, "%-12s")
-                printing.mapping('assignee', _jw_task_person, "%-10s")
-                printing.mapping('reporter', _jw_task_person, "%-10s")
-                printing.mapping('sprint', _jw_task_sprint, "%-10s")
-                printing.mapping('version', _jw_task_version, "%-15s")
-
-            if not params.taskPrint:
-                printing.default()
-            else:
-                printing.include(*params.taskPrint)
-
-        grouping = jwtasks.TasksGroups()
-        for group in params.taskGroup or []:
-            grouping.group(_jw_task_property_getter(group), heading)
+            printing.include(*params.taskPrint)
+
+    grouping = jwtasks.TasksGroups()
+    for group in params.taskGroup or []:
+        grouping.group(_jw_task_property_getter(group), heading)
+    if params.showCount:
+        grouping.count(jwtasks.TasksCount())
+    else:
         grouping.print(printing)
-        grouping.digest(tasks)
+    grouping.digest(tasks)
+
+    if params.taskStream:
+        # Totals are only known once the stream is drained
+        if tasks_total.count == 0:
+            print("Tasks not found")
+        else:
+            print("Tasks total: %u/%u" % (tasks_shown.count, tasks_total.count,))
+
+
+def jw_throughput(params):
+    from jw import analytics as jwanalytics
+
+    props = ['created', 'resolutiondate'] + (params.taskGroup or [])
+    params.taskFields = jwfetch.jw_task_fields(props)
+    # Counted in one pass, no need to keep whole pages around
+    params.taskStream = True
+
+    dateFrom, dateTo = jw_tasks_period(params)
+    tasks = jwfetch.jw_tasks_by_activity(dateFrom, dateTo, params)
+
+    throughput = jwanalytics.Throughput(dateFrom, dateTo, params.showThroughput).digest(tasks, _jw_task_key(params))
+    if throughput.total == 0:
+        print("Tasks not found")
+        return
+
+    print("Tasks total: %u" % throughput.total)
+    for measure in jwanalytics.MEASURES:
+        print()
+        print("%s:" % measure.capitalize())
+        print()
+        throughput.show(measure)
+
+
+def _jw_task_key(params):
+    keyFns = [_jw_task_property_getter(group) for group in params.taskGroup or []]
+    if len(keyFns) == 1:
+        return keyFns[0]
+    elif keyFns:
+        return lambda task: " / ".join(str(fn(task)) for fn in keyFns)
+    else:
+        return None
+
+
+def jw_cycle_time(params):
+    from jw import analytics as jwanalytics
+
+    # Durations are aggregated in one pass over the stream
+    params.taskStream = True
+    found = jw_tasks_lookup(params)
+    if found is None:
+        return
+    tasks, dateFrom, dateTo = found
+    tasks = jw_tasks_changed(params, tasks, dateFrom, dateTo)
+
+    cycle = jwanalytics.CycleTime().digest(tasks, _jw_task_key(params))
+    if cycle.total == 0:
+        print("Tasks not found")
+        return
+
+    print("Tasks total: %u" % cycle.total)
+    print()
+    cycle.show()
+
+
+def jw_target(params):
+    """
+    Run request against the current target.
+    """
+    if params.showTasks and params.showThroughput:
+        jw_throughput(params)
+    elif params.showTasks and params.showCycleTime:
+        jw_cycle_time(params)
+    elif params.showTasks:
+        found = jw_tasks_lookup(params)
+        if found is None:
+            return
+        tasks, dateFrom, dateTo = found
+
+        if params.taskStream:
+            tasks = tasks_total = jwtasks.TasksCounter(tasks)
+        elif len(tasks) == 0:
+            jwlog.info("Tasks not found")
+            return
+        else:
+            tasks_total = len(tasks)
+
+        tasks = jw_tasks_changed(params, tasks, dateFrom, dateTo)
+        jw_tasks_show(params, tasks, tasks_total)
     elif params.showSprints:
+        from jw import sprints as jwsprints
         if params.showInspect:
             jwsprints.debug(params.showInspect)
             return
         jwsprints.run()
     elif params.showVersions:
+        from jw import versions as jwversions
         if params.showInspect:
             jwversions.debug(params.showInspect)
             return
         jwversions.run()
     else:
+        from jw import summary as jwsummary
         jwsummary.run()
 
 
+def _jw_target_merge(params):
+    found = jw_tasks_lookup(params)
+    if found is None:
+        return None
+    tasks, dateFrom, dateTo = found
+    return list(jw_tasks_changed(params, tasks, dateFrom, dateTo)), len(tasks)
+
+
+def jw_targets(configs, params):
+    """
+    Run request against several targets concurrently. Output of each
+    target is shown as it completes, or tasks are merged into one
+    listing grouped by target first.
+    """
+    from jw import fanout as jwfanout
+
+    # Exports are always merged into one stream of rows
+    merge = params.showTasks and (params.taskMerge or params.taskFormat)
+    merge = merge and not (params.showInspect or params.showThroughput or params.showCycleTime)
+    if merge:
+        params.taskMerge = True
+        params.taskStream = None
+        if 'target' not in (params.taskGroup or []):
+            params.taskGroup = ['target'] + (params.taskGroup or [])
+        if not params.taskPrint and params.taskFormat:
+            from jw import export as jwexport
+            params.taskPrint = ['target'] + jwexport.columns()
+        elif not params.taskPrint:
+            params.taskPrint = ['target'] + jwtasks.TasksPrinter().default().columns
+
+    contexts = jwfanout.contexts(configs, params)
+    jwtiming.mark("init")
+
+    failed = None
+    merged, merged_total = [], 0
+    for context, result, output, error in jwfanout.run(contexts, _jw_target_merge if merge else jw_target):
+        if not merge or output:
+            jwlog.info("Target: %s\n", context.target)
+        sys.stdout.write(output)
+        if isinstance(error, SystemExit):
+            failed = error
+            continue
+        elif error:
+            raise error
+        if merge and result:
+            merged.extend(result[0])
+            merged_total += result[1]
+        elif not merge:
+            print()
+
+    if merge:
+        if merged_total == 0:
+            jwlog.info("Tasks not found")
+        else:
+            # Same order regardless of which target completed first
+            order = {config.target: i for i, config in enumerate(configs)}
+            merged.sort(key=lambda task: order[task.target])
+            jw_tasks_show(params, merged, merged_total)
+
+    if failed:
+        raise failed
+
+
+def jw_main(params):
+    jwlog.data = bool(params.taskFormat and not params.taskOutput)
+    configs = jwconfig.targets(params.project)
+    jwtiming.mark("config")
+
+    try:
+        if len(configs) > 1:
+            jw_targets(configs, params)
+            return
+
+        jwfetch.jw_init(configs[0], params)
+        jwtiming.mark("init")
+
+        jw_target(params)
+    except jwfetch.OfflineError as e:
+        die("Target %s not cached, run once online" % e.target)
+
+
 if __name__ == '__main__':
-    jw_run()
+    try:
+        jw_run()
+    finally:
+        jwtiming.report()
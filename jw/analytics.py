@@ -0,0 +1,276 @@
+
+import math
+import datetime
+from array import array
+
+from . import dates as jwdates
+from . import timing as jwtiming
+from . import properties as jwprops
+
+
+PERIODS = {
+    'day': 1,
+    'week': 7,
+}
+
+MEASURES = ('created', 'resolved', 'changed')
+
+
+def _ordinal(dt):
+    # Day number, missing dates fall out of any period
+    return dt.toordinal() if dt else -1
+
+
+def _inside(dt, dateFrom, dateTo):
+    return dt is not None and dateFrom <= dt <= dateTo
+
+
+class Throughput:
+    """
+    Tasks created, resolved and changed per period and group, counted
+    over day numbers in one vectorized step (numpy when available).
+    Changes come from the changelog, a task counts once per period it
+    was changed in.
+    """
+
+    def __init__(self, dateFrom, dateTo, period='week'):
+        self.dateFrom = dateFrom
+        self.dateTo = dateTo
+        self.days = PERIODS[period]
+        if self.days == 7:
+            self.start = jwdates.week_start(dateFrom)
+        else:
+            self.start = dateFrom.replace(hour=0, minute=0, second=0, microsecond=0)
+        span = (dateTo - self.start).total_seconds() / (self.days * 86400)
+        self.count = max(1, math.ceil(span))
+        self.columns = []
+        self.counts = {}
+        self.total = 0
+
+    def periods(self):
+        return [self.start + datetime.timedelta(days=i * self.days) for i in range(self.count)]
+
+    def digest(self, tasks, keyFn=None):
+        codes = {}
+        days = {measure: [] for measure in MEASURES}
+        groups = {measure: [] for measure in MEASURES}
+        start = self.start.toordinal()
+        with jwtiming.phase("collect"):
+            for task in tasks:
+                key = keyFn(task) if keyFn else "Tasks"
+                code = codes.get(key)
+                if code is None:
+                    code = codes[key] = len(codes)
+                inside = (_inside(task.created, self.dateFrom, self.dateTo) or
+                          _inside(task.resolved, self.dateFrom, self.dateTo))
+                days['created'].append(_ordinal(task.created))
+                groups['created'].append(code)
+                days['resolved'].append(_ordinal(task.resolved))
+                groups['resolved'].append(code)
+
+                seen = set()
+                for created, author, items in task.changelog or ():
+                    inside = inside or _inside(created, self.dateFrom, self.dateTo)
+                    day = created.toordinal()
+                    period = (day - start) // self.days
+                    if period not in seen:
+                        seen.add(period)
+                        days['changed'].append(day)
+                        groups['changed'].append(code)
+                # Only tasks active within the period are told in total
+                if inside:
+                    self.total += 1
+
+        width = len(codes)
+        with jwtiming.phase("count"):
+            for measure in MEASURES:
+                self.counts[measure] = _count(days[measure], groups[measure], start,
+                                              self.days, self.count, width)
+
+        # Columns by name, each with its index into counted rows
+        self.columns = sorted(codes.items(), key=lambda item: str(item[0]))
+        return self
+
+    def show(self, measure):
+        rows = self.counts[measure]
+        names = [str(name)[:14] for name, code in self.columns]
+        widths = [max(6, len(name)) for name in names]
+
+        print("%-18s" % "Period", end='')
+        for name, width in zip(names, widths):
+            print(" %*s" % (width, name), end='')
+        print(" %6s" % "Total")
+
+        for period, row in zip(self.periods(), rows):
+            if self.days == 7:
+                label = "%s w%02i" % (period.strftime("%Y-%m-%d"), jwdates.year_week(period))
+            else:
+                label = period.strftime("%Y-%m-%d %a")
+            print("%-18s" % label, end='')
+            for (name, code), width in zip(self.columns, widths):
+                print(" %*u" % (width, row[code]), end='')
+            print(" %6u" % sum(row))
+
+
+def _count(days, groups, start, step, count, width):
+    """
+    Matrix of count rows by width columns, tasks being bucketed by
+    (day - start) // step.
+    """
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None and days:
+        days = numpy.asarray(days, dtype=numpy.int64)
+        groups = numpy.asarray(groups, dtype=numpy.int64)
+        index = (days - start) // step
+        valid = (days >= 0) & (index >= 0) & (index < count)
+        cells = numpy.bincount(index[valid] * width + groups[valid], minlength=count * width)
+        return cells.reshape(count, width).tolist()
+
+    rows = [[0] * width for i in range(count)]
+    for day, group in zip(days, groups):
+        if day < 0:
+            continue
+        index = (day - start) // step
+        if 0 <= index < count:
+            rows[index][group] += 1
+    return rows
+
+
+PERCENTILES = (50, 85, 95)
+
+
+def _percentile(values, p):
+    # Linear interpolation between closest ranks of sorted values
+    if not values:
+        return None
+    pos = (len(values) - 1) * p / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class Durations:
+
+    __slots__ = ('lead', 'cycle', 'states')
+
+    def __init__(self):
+        self.lead = array('d')
+        self.cycle = array('d')
+        self.states = {}
+
+
+class CycleTime:
+    """
+    Lead time (created to resolved), cycle time (first work started to
+    resolved) and time spent in each status, in days per group. Status
+    history of each task is walked once, only durations are kept.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.datetime.now()
+        self.working = frozenset(jwprops.taskStates["Working"])
+        self.complete = frozenset(jwprops.taskStates["Complete"])
+        self.groups = {}
+        self.total = 0
+
+    def add(self, task, key="Tasks"):
+        durations = self.groups.get(key)
+        if durations is None:
+            durations = self.groups[key] = Durations()
+        self.total += 1
+
+        created = task.created
+        if not created:
+            return
+        changes = task.changelog.transitions('status') if task.changelog else ()
+
+        status, start, begun = None, created, None
+        spent = {}
+        for date, fromStatus, toStatus in changes:
+            if status is None:
+                status = fromStatus
+                if status in self.working:
+                    begun = created
+            spent[status] = spent.get(status, 0) + (date - start).total_seconds()
+            status, start = toStatus, date
+            if begun is None and status in self.working:
+                begun = date
+        if status is None:
+            status = task.status
+            if status in self.working:
+                begun = created
+        # Current status counts until now, unless the task is done
+        if status not in self.complete:
+            spent[status] = spent.get(status, 0) + (self.now - start).total_seconds()
+
+        for name, seconds in spent.items():
+            values = durations.states.get(name)
+            if values is None:
+                values = durations.states[name] = array('d')
+            values.append(seconds / 86400)
+
+        if task.resolved:
+            durations.lead.append((task.resolved - created).total_seconds() / 86400)
+            if begun:
+                durations.cycle.append((task.resolved - begun).total_seconds() / 86400)
+
+    def digest(self, tasks, keyFn=None):
+        with jwtiming.phase("collect"):
+            for task in tasks:
+                self.add(task, keyFn(task) if keyFn else "Tasks")
+        return self
+
+    def statuses(self):
+        """
+        Statuses seen, in pending, working, complete order.
+        """
+        seen = set()
+        for durations in self.groups.values():
+            seen.update(durations.states)
+        order = [name for state in ("Pending", "Working", "Complete")
+                 for name in jwprops.taskStates[state] if name in seen]
+        return order + sorted(name for name in seen if name not in order and name)
+
+    def show(self):
+        keys = sorted(self.groups, key=str)
+
+        print("%-20s %6s" % ("Group", "Done"), end='')
+        for p in PERCENTILES:
+            print(" %9s" % ("lead p%i" % p), end='')
+        for p in PERCENTILES:
+            print(" %9s" % ("cycle p%i" % p), end='')
+        print()
+        for key in keys:
+            durations = self.groups[key]
+            lead = sorted(durations.lead)
+            cycle = sorted(durations.cycle)
+            print("%-20s %6u" % (str(key)[:20], len(lead)), end='')
+            for values in (lead, cycle):
+                for p in PERCENTILES:
+                    print(" %9s" % _days(_percentile(values, p)), end='')
+            print()
+
+        statuses = self.statuses()
+        names = [name[:12] for name in statuses]
+        widths = [max(6, len(name)) for name in names]
+        print()
+        print("Time in status (days, median):")
+        print()
+        print("%-20s" % "Group", end='')
+        for name, width in zip(names, widths):
+            print(" %*s" % (width, name), end='')
+        print()
+        for key in keys:
+            states = self.groups[key].states
+            print("%-20s" % str(key)[:20], end='')
+            for name, width in zip(statuses, widths):
+                print(" %*s" % (width, _days(_percentile(sorted(states.get(name, ())), 50))), end='')
+            print()
+
+
+def _days(value):
+    return "-" if value is None else "%.1f" % value
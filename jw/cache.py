@@ -0,0 +1,90 @@
+
+import os
+import json
+import time
+import atexit
+import threading
+from concurrent.futures import Future
+
+
+def path(config):
+    if config.cache:
+        return os.path.expanduser(config.cache)
+    if os.getenv("HOME"):
+        return os.getenv("HOME") + "/.jw.cache"
+    return "jw.cache"
+
+
+class Cache:
+    """
+    Metadata cache: memoized within a run, persisted across runs as
+    JSON with per-entry timestamps. Concurrent requests of the same
+    key share one fetch.
+    """
+
+    def __init__(self, path, ttl=3600, refresh=False):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.pending = {}
+        self.dirty = False
+        if not refresh:
+            self.load()
+        atexit.register(self.save)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            try:
+                with open(self.path + ".tmp", "w") as f:
+                    json.dump(self.entries, f)
+                os.replace(self.path + ".tmp", self.path)
+            except OSError:
+                return
+            self.dirty = False
+
+    def get(self, key, fetchFn, stale=False):
+        """
+        Return cached value for key or fetch it; stale entries are
+        accepted when stale is set (e.g. offline).
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and (stale or time.time() - entry[0] < self.ttl):
+                return entry[1]
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.pending[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetchFn()
+        except BaseException as e:
+            with self.lock:
+                del self.pending[key]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            self.entries[key] = [time.time(), value]
+            self.dirty = True
+            del self.pending[key]
+        future.set_result(value)
+        return value
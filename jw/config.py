@@ -27,7 +27,7 @@ class Section:
             self.section[name] = value
 
 
-def get(project=None):
+def _read():
     config = ConfigParser()
 
     files = []
@@ -37,16 +37,40 @@ def get(project=None):
         files.append(os.getenv("HOME") + "/.jw.conf")
 
     config.read(files)
+    return config
+
 
+def _section(config, project):
     section = {}
-    if project:
-        section.update(config.items(project))
-    else:
-        section.update(config.items(config.sections()[0]))
+    section.update(config.items(project))
+    section["target"] = project
 
     return Section(section)
 
 
+def get(project=None):
+    config = _read()
+
+    if not project:
+        project = config.sections()[0]
+
+    return _section(config, project)
+
+
+def targets(projects=None):
+    """
+    Sections of the named targets, 'all' selects every configured one.
+    """
+    config = _read()
+
+    if not projects:
+        projects = config.sections()[:1]
+    elif 'all' in projects:
+        projects = config.sections()
+
+    return [_section(config, project) for project in projects]
+
+
 if __name__ == '__main__':
     config = jw_config()
     print(config)
@@ -0,0 +1,123 @@
+
+import os
+import sys
+import json
+import socket
+import argparse
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+
+from . import fetch as jwfetch
+from . import timing as jwtiming
+
+
+# Marks end of output, followed by exit status byte
+TRAILER = b"\0"
+
+
+def path():
+    if os.getenv("JW_SOCKET"):
+        return os.getenv("JW_SOCKET")
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return os.getenv("XDG_RUNTIME_DIR") + "/jw.sock"
+    if os.getenv("HOME"):
+        return os.getenv("HOME") + "/.jw.sock"
+    return "jw.sock"
+
+
+def _handle(conn, mainFn):
+    with conn.makefile("rb") as rfile:
+        request = json.loads(rfile.readline())
+
+    params = argparse.Namespace(**request["params"])
+    os.chdir(request["cwd"])
+    jwtiming.reset()
+    jwtiming.setup(params)
+
+    code = 0
+    with conn.makefile("w", buffering=65536, encoding="utf-8", errors="replace") as out:
+        with redirect_stdout(out), redirect_stderr(out):
+            try:
+                with jwtiming.profiled(params.profileDump):
+                    mainFn(params)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            jwtiming.report()
+
+    for cache in jwfetch.jw_caches.values():
+        cache.save()
+    conn.sendall(TRAILER + bytes([code & 0xff]))
+
+
+def serve(mainFn, results_ttl=60):
+    """
+    Serve requests one at a time, JIRA clients, caches and recent
+    search results stay warm between them.
+    """
+    sock_path = path()
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)
+
+    jwfetch.jw_results_ttl = results_ttl
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(sock_path)
+    os.chmod(sock_path, 0o600)
+    sock.listen(16)
+    print("Serving on %s" % sock_path, file=sys.stderr)
+
+    try:
+        while True:
+            conn, addr = sock.accept()
+            with conn:
+                try:
+                    _handle(conn, mainFn)
+                except (OSError, ValueError):
+                    # Client went away or sent garbage
+                    continue
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        os.unlink(sock_path)
+
+
+def forward(params):
+    """
+    Run request in the daemon, if there is one. Returns exit status
+    or None when no daemon is listening.
+    """
+    # Output comes back as one stream, messages would corrupt data
+    # exported to stdout; such requests run locally.
+    if params.taskFormat and not params.taskOutput:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path())
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"cwd": os.getcwd(), "params": vars(params)}
+    with sock:
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        out = sys.stdout.buffer
+        tail = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            data = tail + data
+            # Hold back possible trailer until the stream ends
+            out.write(data[:-2])
+            tail = data[-2:]
+        out.flush()
+
+    if len(tail) == 2 and tail[:1] == TRAILER:
+        return tail[1]
+    sys.stdout.buffer.write(tail)
+    return 1
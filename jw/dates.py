@@ -0,0 +1,58 @@
+
+import re
+import math
+import datetime
+
+
+def year_week(dt):
+    dcurrent = dt.date()
+    dfirst = dcurrent.replace(month = 1, day = 1)
+    drange = dcurrent - dfirst
+    return math.floor(drange.days / 7)
+
+
+def week_start(dt):
+    """
+    Midnight of the Monday starting the week of dt.
+    """
+    dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    return dt - datetime.timedelta(days=dt.weekday())
+
+
+def date_by_relevance(date_range):
+    date_offset, sep, date_period = date_range.partition(':')
+    try:
+        period = int(date_period) if date_period else 1
+    except ValueError:
+        period = 1
+
+    match = re.match("(\-?\d+)([hdw])", date_offset)
+    if not match:
+        return None, None
+
+    count = match.group(1)
+    scale = match.group(2)
+    dnow = datetime.datetime.now().replace(tzinfo=None)
+    if scale == "h":
+        dnew = dnow + datetime.timedelta(hours=int(count))
+        if date_period:
+            dnow = dnew + datetime.timedelta(hours=int(period))
+    elif scale == "d":
+        dnow = dnow.replace(hour=0, minute=0, second=0, microsecond=0)
+        dnew = dnow + datetime.timedelta(days=int(count))
+        if date_period:
+            dnow = dnew + datetime.timedelta(days=int(period))
+    elif scale == "w":
+        dnow = week_start(dnow)
+        dnew = dnow + datetime.timedelta(weeks=int(count))
+        if date_period:
+            dnow = dnew + datetime.timedelta(weeks=int(period))
+
+    if dnow > dnew:
+        dfrom = dnew
+        dto = dnow
+    else:
+        dfrom = dnow
+        dto = dnew
+
+    return dfrom, dto
@@ -0,0 +1,186 @@
+
+import io
+import sys
+import csv
+import json
+
+from . import properties as jwprops
+
+
+def _date(value):
+    return value.isoformat() if value else None
+
+
+COLUMNS = {
+    'key': lambda task: task.key,
+    'type': lambda task: task.type,
+    'status': lambda task: task.status,
+    'assignee': lambda task: task.assignee,
+    'reporter': lambda task: task.reporter,
+    'summary': lambda task: task.summary,
+    'sprint': lambda task: jwprops.taskSprints(task),
+    'version': lambda task: jwprops.taskVersions(task),
+    'created': lambda task: task.created,
+    'updated': lambda task: task.updated,
+    'resolved': lambda task: task.resolved,
+    'target': lambda task: task.target,
+}
+
+# Columns holding several values and dates
+LISTS = ('sprint', 'version')
+DATES = ('created', 'updated', 'resolved')
+
+BATCH = 1024
+
+
+def columns(names=None):
+    names = [name for name in names or () if name in COLUMNS]
+    return names or [name for name in COLUMNS if name != 'target']
+
+
+def _batches(tasks, size=BATCH):
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Exporter:
+
+    binary = False
+
+    def __init__(self, out, names, owned=False):
+        self.out = out
+        self.names = names
+        self.owned = owned
+
+    def close(self):
+        if self.owned:
+            self.out.close()
+        else:
+            self.out.flush()
+
+
+class JsonLines(Exporter):
+    """
+    One JSON object per task, written a batch of rows at a time.
+    """
+
+    def __init__(self, out, names, owned=False):
+        super().__init__(out, names, owned)
+        self.getters = [(name, COLUMNS[name], name in DATES) for name in names]
+
+    def write(self, tasks):
+        count = 0
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        for batch in _batches(tasks):
+            rows = []
+            for task in batch:
+                rows.append(dumps({name: _date(getter(task)) if date else getter(task)
+                                   for name, getter, date in self.getters}))
+            rows.append("")
+            self.out.write("\n".join(rows))
+            count += len(batch)
+        return count
+
+
+class Csv(Exporter):
+    """
+    CSV with header row, several values of a cell are ';' separated.
+    """
+
+    def __init__(self, out, names, owned=False):
+        super().__init__(out, names, owned)
+        self.getters = [(COLUMNS[name], name in LISTS, name in DATES) for name in names]
+
+    def write(self, tasks):
+        count = 0
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(self.names)
+        for batch in _batches(tasks):
+            for task in batch:
+                row = []
+                for getter, many, date in self.getters:
+                    value = getter(task)
+                    if many:
+                        value = ";".join(value)
+                    elif date:
+                        value = _date(value)
+                    row.append(value)
+                writer.writerow(row)
+            self.out.write(buf.getvalue())
+            buf.seek(0)
+            buf.truncate()
+            count += len(batch)
+        if buf.tell():
+            self.out.write(buf.getvalue())
+        return count
+
+
+class Arrow(Exporter):
+    """
+    Arrow IPC stream of record batches, cells go into typed columns
+    without formatting them as text.
+    """
+
+    binary = True
+
+    def __init__(self, out, names, owned=False):
+        import pyarrow
+        import pyarrow.ipc
+
+        super().__init__(out, names, owned)
+        self.pa = pyarrow
+        self.getters = [COLUMNS[name] for name in names]
+        fields = []
+        for name in names:
+            if name in LISTS:
+                kind = pyarrow.list_(pyarrow.string())
+            elif name in DATES:
+                kind = pyarrow.timestamp("us")
+            else:
+                kind = pyarrow.string()
+            fields.append(pyarrow.field(name, kind))
+        self.schema = pyarrow.schema(fields)
+        self.writer = pyarrow.ipc.new_stream(out, self.schema)
+
+    def write(self, tasks):
+        count = 0
+        for batch in _batches(tasks, BATCH * 8):
+            arrays = [self.pa.array([getter(task) for task in batch], type=field.type)
+                      for getter, field in zip(self.getters, self.schema)]
+            self.writer.write_batch(self.pa.record_batch(arrays, schema=self.schema))
+            count += len(batch)
+        return count
+
+    def close(self):
+        self.writer.close()
+        super().close()
+
+
+FORMATS = {
+    'jsonl': JsonLines,
+    'csv': Csv,
+    'arrow': Arrow,
+}
+
+
+def writer(fmt, names=None, path=None):
+    """
+    Exporter of fmt writing into path, or stdout.
+    """
+    cls = FORMATS[fmt]
+    if path:
+        if cls.binary:
+            out = open(path, "wb")
+        else:
+            out = open(path, "w", newline="", encoding="utf-8")
+        return cls(out, columns(names), owned=True)
+
+    out = sys.stdout.buffer if cls.binary else sys.stdout
+    return cls(out, columns(names))
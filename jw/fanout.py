@@ -0,0 +1,63 @@
+
+import io
+import sys
+import argparse
+import threading
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import fetch as jwfetch
+
+
+class Output:
+    """
+    stdout proxy, output of threads capturing it goes to their own
+    buffer instead.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.local = threading.local()
+
+    def write(self, data):
+        buf = getattr(self.local, "buf", None)
+        return (buf or self.out).write(data)
+
+    def flush(self):
+        if not getattr(self.local, "buf", None):
+            self.out.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.out, name)
+
+
+def contexts(configs, params):
+    """
+    Fetch context per target, each with its own copy of params.
+    """
+    return [jwfetch.jw_init(config, argparse.Namespace(**vars(params))) for config in configs]
+
+
+def run(contexts, targetFn):
+    """
+    Run targetFn(params) for every target concurrently. Generates
+    (context, result, output, error) in completion order, output
+    being what the target printed.
+    """
+    out = Output(sys.stdout)
+
+    def work(context):
+        jwfetch.jw_use(context)
+        buf = out.local.buf = io.StringIO()
+        try:
+            return targetFn(context.params), buf.getvalue(), None
+        except BaseException as e:
+            return None, buf.getvalue(), e
+        finally:
+            out.local.buf = None
+
+    with redirect_stdout(out), ThreadPoolExecutor(max_workers=len(contexts)) as executor:
+        futures = {executor.submit(work, context): context for context in contexts}
+        for future in as_completed(futures):
+            result, output, error = future.result()
+            yield futures[future], result, output, error
@@ -1,50 +1,389 @@
 
 import sys
+import time
 import datetime
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import cache as jwcache
+from . import session as jwsession
+from . import timing as jwtiming
+from . import records as jwrecords
+from . import properties as jwprops
+from . import tasks as jwtasks
+from . import timeline as jwtimeline
+
+
+jw_lock = threading.Lock()
+jw_locks = {}
+jw_local = threading.local()
+
+# Long lived state, kept across jw_init() calls of a resident process
+jw_clients = {}
+jw_caches = {}
+jw_stores = {}
+jw_results = {}
+jw_results_ttl = 0
+jw_timelines = {}
+
+
+class OfflineError(RuntimeError):
+    """
+    Request needing JIRA access in offline mode, i.e. not cached yet.
+    """
+
+    def __init__(self, target):
+        super().__init__("No JIRA access in offline mode")
+        self.target = target
+
+
+class Context:
+    """
+    Fetch state of one configured target. Current context is kept per
+    thread, so several targets can be fetched concurrently.
+    """
+
+    def __init__(self, config, params):
+        self.config = config
+        self.params = params
+        self.target = config.target
+        self.project = config.project
+        self.board = config.board
+        self.cache = None
+        self.store = None
 
-from jira import JIRA
 
+def jw_init(config, params):
+    """
+    Set up context of the target for the current thread.
+    """
+    context = Context(config, params)
+
+    path = jwcache.path(config)
+    with jw_lock:
+        if path not in jw_caches:
+            jw_caches[path] = jwcache.Cache(path,
+                                            ttl=int(config.cache_ttl or 3600),
+                                            refresh=params.refresh)
+        elif params.refresh:
+            jw_caches[path].clear()
+        context.cache = jw_caches[path]
 
-jira_project = None
-jira_board = None
-jira = None
-jw_config = None
-jw_params = None
+        if config.store or params.offline:
+            from . import store as jwstore
+            path = jwstore.path(config)
+            if (path, config.target) not in jw_stores:
+                jw_stores[(path, config.target)] = jwstore.Store(path, config.target)
+            context.store = jw_stores[(path, config.target)]
+
+    jw_use(context)
+    return context
+
+
+def jw_use(context):
+    jw_local.context = context
+
+
+def jw_context():
+    return jw_local.context
+
+
+def jw_bind(fn):
+    """
+    Wrap fn to run in the current context on another thread.
+    """
+    context = jw_context()
+
+    def bound(*args, **kwargs):
+        jw_local.context = context
+        return fn(*args, **kwargs)
+    return bound
+
+
+def _jw_jira():
+    """
+    JIRA client is only built on first request; server info is taken
+    from the metadata cache and session cookies from the previous run.
+    """
+    context = jw_context()
+    key = _jw_client_key(context.config)
+    with jw_lock:
+        if key in jw_clients:
+            return jw_clients[key]
+        if context.params.offline:
+            raise OfflineError(context.target)
+        # Clients of other targets may be built meanwhile
+        lock = jw_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        if key in jw_clients:
+            return jw_clients[key]
+
+        with jwtiming.phase("client"):
+            from jira import JIRA
+            from . import transport as jwtransport
+
+            config = context.config
+            options = {
+                "server": config.server,
+                "agile_rest_path": "agile",
+                "cookies": jwsession.load(jwsession.path(config), _jw_cache_key(config, "session")),
+            }
+            basic_auth = (config.username, config.password,)
+            # Retries are left to the transport, shared by all requests
+            client = JIRA(options=options, basic_auth=basic_auth, get_server_info=False, max_retries=0)
+            jwtransport.mount(client._session, config, jw_workers())
+            client._session.hooks["response"].append(jwtiming.response)
+
+            info = context.cache.get(_jw_cache_key(config, "server-info"), client.server_info)
+            client._version = tuple(info["versionNumbers"])
+            client.deploymentType = info.get("deploymentType")
+
+            jwsession.track(jwsession.path(config), _jw_cache_key(config, "session"), client._session)
+
+        jw_clients[key] = client
+        return client
+
+
+def _jw_client_key(config):
+    # Resident process serves configs of different working directories,
+    # same target name may stand for another server or account there
+    return (config.target, config.server, config.username, config.password)
+
+
+def _jw_cache_key(config, name):
+    # Persisted too, so the account is told apart without its password
+    return "%s:%s@%s:%s" % (config.target, config.username, config.server, name)
+
+
+def jw_workers():
+    context = jw_context()
+    return int(context.params.fetchWorkers or context.config.workers or 4)
+
+
+def jw_page_size():
+    return int(jw_context().config.page_size or 100)
+
+
+def _jw_search_page(query, startAt, maxResults, fields=None, expand=None, validate=True):
+    # Plain GET on purpose: search_issues() resolves field names through
+    # an extra fields() request on every new client.
+    return _jw_jira()._get_json("search", params={
+        "jql": query,
+        "startAt": startAt,
+        "maxResults": maxResults,
+        "validateQuery": validate,
+        "fields": ",".join(fields) if fields else "*all",
+        "expand": expand,
+    })
 
 
-def jw_init(config, params):
-    global jira_project
-    global jira_board
-    global jira
-    global jw_config
-    global jw_params
-
-    jw_config = config
-    jw_params = params
-
-    jira_project = config.project
-    jira_board = config.board
-    options = {
-        "server": config.server,
-        "agile_rest_path": "agile",
+def _jw_search_token(query, fields=None, expand=None, count=None):
+    # Cloud token based search can only be walked page by page
+    fetched = 0
+    params = {
+        "jql": query,
+        "maxResults": jw_page_size(),
+        "fields": ",".join(fields) if fields else "*all",
+        "expand": expand,
     }
-    basic_auth = (config.username, config.password,)
-    jira = JIRA(options=options, basic_auth=basic_auth)
+    while True:
+        page = _jw_jira()._get_json("search/jql", params=params)
+        issues = page["issues"]
+        if count:
+            issues = issues[:count - fetched]
+        fetched += len(issues)
+        yield issues
+        if page.get("isLast", True) or not page.get("nextPageToken"):
+            break
+        if count and fetched >= count:
+            break
+        params["nextPageToken"] = page["nextPageToken"]
+
+
+@jwtiming.timed("search")
+def jw_search(query, fields=None, expand=None, count=None):
+    """
+    Fetch raw issues matching query. Results are reused for
+    jw_results_ttl seconds (resident process only).
+    """
+    if not jw_results_ttl:
+        return _jw_search_all(query, fields, expand, count)
+
+    key = (_jw_client_key(jw_context().config), query, tuple(fields or ()), expand, count)
+    result = jw_results.get(key)
+    if result and time.time() - result[0] < jw_results_ttl:
+        return list(result[1])
+
+    issues = _jw_search_all(query, fields, expand, count)
+    jw_results[key] = (time.time(), issues)
+    return list(issues)
+
+
+def _jw_search_all(query, fields=None, expand=None, count=None, validate=True):
+    issues = []
+    for page in jw_search_pages(query, fields, expand, count, validate):
+        issues.extend(page)
+    return issues
+
+
+def jw_search_pages(query, fields=None, expand=None, count=None, validate=True):
+    """
+    Generate pages of raw issues in order. The first page tells the
+    total, remaining pages are requested concurrently, at most
+    jw_workers() of them ahead of the consumer.
+    """
+    if _jw_jira()._is_cloud:
+        yield from _jw_search_token(query, fields, expand, count)
+        return
+
+    pageSize = min(count, jw_page_size()) if count else jw_page_size()
+    page = _jw_search_page(query, 0, pageSize, fields, expand, validate)
+    issues = page["issues"]
+    total = min(page["total"], count) if count else page["total"]
+    yield issues[:total]
+    # Server may clamp the page size
+    pageSize = len(issues)
+    if not pageSize or pageSize >= total:
+        return
+
+    def fetch(startAt):
+        return _jw_search_page(query, startAt, min(pageSize, total - startAt), fields, expand, validate)["issues"]
+
+    workers = jw_workers()
+    fetchFn = jw_bind(fetch)
+    starts = iter(range(pageSize, total, pageSize))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Next page is requested as one is taken, so a slow consumer
+        # keeps memory bounded
+        futures = deque(executor.submit(fetchFn, startAt) for startAt in itertools.islice(starts, workers))
+        while futures:
+            issues = futures.popleft().result()
+            for startAt in itertools.islice(starts, 1):
+                futures.append(executor.submit(fetchFn, startAt))
+            yield issues
+    finally:
+        # Consumer may stop early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _jw_cached(name, fetchFn):
+    # Cache entries are kept per configured target, server and account
+    context = jw_context()
+    return context.cache.get(_jw_cache_key(context.config, name), fetchFn,
+                             stale=context.params.offline)
+
+
+class Resource:
+    """
+    Read-only view of cached resource JSON, attribute access like
+    python-jira resources without importing them.
+    """
+
+    def __init__(self, raw):
+        self.__dict__.update(raw)
+        self.raw = raw
+
+
+def _jw_resources(items):
+    return [Resource(raw) for raw in items]
+
+
+@jwtiming.timed("sprint-field")
+def jw_sprint_field():
+    def fetch():
+        for field in _jw_jira().fields():
+            schema = field.get("schema") or {}
+            if schema.get("custom") == "com.pyxis.greenhopper.jira:gh-sprint":
+                return field["id"]
+        return None
+
+    return _jw_cached("sprint-field", fetch)
+
+
+def _jw_record_sprint_field():
+    # Records fall back to looking for sprint values themselves when
+    # the field can not be discovered (no access, not cached offline)
+    try:
+        return jw_sprint_field()
+    except OfflineError:
+        return None
+    except Exception as e:
+        # Raised by a client, so jira is loaded already
+        from jira.exceptions import JIRAError
+        if not isinstance(e, JIRAError):
+            raise
+        return None
+
+
+def jw_task_fields(props):
+    """
+    Translate task property names into the issue fields to request.
+    """
+    fields = []
+    for prop in props:
+        if prop == 'key' or prop == 'target':
+            continue
+        elif prop == 'type':
+            field = 'issuetype'
+        elif prop == 'state' or prop == 'status':
+            field = 'status'
+        elif prop == 'version':
+            field = 'fixVersions'
+        elif prop == 'resolved':
+            field = 'resolutiondate'
+        elif prop == 'sprint':
+            # Unknown field, all are requested
+            field = _jw_record_sprint_field()
+            if not field:
+                return None
+        else:
+            field = prop
+
+        if field not in fields:
+            fields.append(field)
+
+    # Explicit empty list would mean all fields
+    return fields or ['issuetype']
 
 
+def jw_timezone():
+    """
+    Timezone of the user's profile, JQL dates are evaluated in it.
+    Returns None (local time) when unknown.
+    """
+    name = _jw_cached("timezone", lambda: _jw_jira().myself().get("timeZone"))
+    if not name:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except (ImportError, KeyError, ValueError):
+        return None
+
+
+@jwtiming.timed("projects")
 def jw_projects():
-    return jira.projects()
+    items = _jw_cached("projects", lambda: [project.raw for project in _jw_jira().projects()])
+    return _jw_resources(items)
 
 
+@jwtiming.timed("boards")
 def jw_boards():
-    return jira.boards()
+    items = _jw_cached("boards", lambda: [board.raw for board in _jw_jira().boards(maxResults=False)])
+    return _jw_resources(items)
 
 
-def jw_versions(project=None):
-    try:
-        versions = jira.project_versions(project.key if project else jira_project)
-    except:
-        return []
+def _jw_version_items(key):
+    return _jw_cached("versions:%s" % key,
+                      lambda: [version.raw for version in _jw_jira().project_versions(key)])
+
+
+def _jw_versions(items):
+    versions = _jw_resources(items)
 
     for version in versions:
         if hasattr(version, 'startDate'):
@@ -66,15 +405,32 @@ def jw_versions(project=None):
     return sorted(versions, key=lambda version: version.dateTo and datetime.datetime.timestamp(version.dateTo) or sys.maxsize)
 
 
-def jw_sprints(board=None):
-    if not board:
-        boards = jira.boards()
-        board = [board for board in boards if board.name == jira_board][0]
+@jwtiming.timed("versions")
+def jw_versions(project=None):
+    key = project.key if project else jw_context().project
     try:
-        sprints = jira.sprints(board.id)
+        items = _jw_version_items(key)
+    except OfflineError:
+        raise
     except:
         return []
 
+    return _jw_versions(items)
+
+
+def _jw_board():
+    boards = jw_boards()
+    return [board for board in boards if board.name == jw_context().board][0]
+
+
+def _jw_sprint_items(board):
+    return _jw_cached("sprints:%s" % board.id,
+                      lambda: [sprint.raw for sprint in _jw_jira().sprints(board.id, maxResults=False)])
+
+
+def _jw_sprints(items):
+    sprints = _jw_resources(items)
+
     for sprint in sprints:
         if hasattr(sprint, 'startDate'):
             sprint.dateFrom = datetime.datetime.strptime(sprint.startDate, "%Y-%m-%dT%H:%M:%S.%f%z").replace(tzinfo=None)
@@ -94,15 +450,167 @@ def jw_sprints(board=None):
     return sorted(sprints, key=lambda sprint: sprint.dateFrom and datetime.datetime.timestamp(sprint.dateFrom) or sys.maxsize)
 
 
-def jw_tasks(params, version=None, sprint=None, dateFrom=None, dateTo=None, taskState="updated", taskCount=1000):
+@jwtiming.timed("sprints")
+def jw_sprints(board=None):
+    board = board or _jw_board()
+    try:
+        items = _jw_sprint_items(board)
+    except OfflineError:
+        raise
+    except:
+        return []
+
+    return _jw_sprints(items)
+
+
+def _jw_timeline(name, itemsFn, buildFn):
+    """
+    Timeline of resources, kept per target, server and account until
+    their cached items get fetched again.
+    """
+    try:
+        items = itemsFn()
+    except OfflineError:
+        raise
+    except:
+        return jwtimeline.Timeline([])
+
+    key = _jw_cache_key(jw_context().config, name)
+    with jw_lock:
+        entry = jw_timelines.get(key)
+    if entry and entry[0] is items:
+        return entry[1]
+
+    timeline = jwtimeline.Timeline(buildFn(items))
+    with jw_lock:
+        jw_timelines[key] = (items, timeline)
+    return timeline
+
+
+@jwtiming.timed("versions")
+def jw_version_timeline():
+    key = jw_context().project
+    return _jw_timeline("versions:%s" % key, lambda: _jw_version_items(key), _jw_versions)
+
+
+@jwtiming.timed("sprints")
+def jw_sprint_timeline():
+    board = _jw_board()
+    return _jw_timeline("sprints:%s" % board.id, lambda: _jw_sprint_items(board), _jw_sprints)
+
+
+def jw_changed_pushdown():
+    """
+    Whether --change-* filters go to the server as JQL CHANGED
+    predicates (JIRA 5.0+) instead of filtering changelogs locally.
+    """
+    context = jw_context()
+    if context.store:
+        return False
+    if context.config.jql_changed:
+        return context.config.jql_changed.lower() in ("1", "yes", "true", "on")
+    client = _jw_jira()
+    return client._is_cloud or client._version >= (5, 0)
+
+
+def _jw_changed(field, dateFrom, dateTo):
+    if dateFrom and dateTo:
+        return '%s CHANGED DURING ("%s", "%s")' % (field,
+                                                  dateFrom.strftime("%Y-%m-%d %H:%M"),
+                                                  dateTo.strftime("%Y-%m-%d %H:%M"))
+    elif dateFrom:
+        return '%s CHANGED AFTER "%s"' % (field, dateFrom.strftime("%Y-%m-%d %H:%M"))
+    elif dateTo:
+        return '%s CHANGED BEFORE "%s"' % (field, dateTo.strftime("%Y-%m-%d %H:%M"))
+    else:
+        return '%s CHANGED' % field
+
+
+def _jw_task_match(task, version=None, sprint=None, dateFrom=None, dateTo=None, taskState="updated"):
+    """
+    Local counterpart of the JQL built by jw_tasks, used on stored tasks.
+    """
+    if version and version not in task.versions:
+        return False
+    if sprint and sprint not in task.sprints:
+        return False
+    if taskState == "active":
+        # Any activity within the period: updated since, created by its end
+        if dateFrom and (not task.updated or task.updated < dateFrom):
+            return False
+        if dateTo and (not task.created or task.created > dateTo):
+            return False
+    elif dateFrom or dateTo:
+        if taskState == "updated":
+            date = task.updated
+        elif taskState == "resolved":
+            date = task.resolved
+        elif taskState == "created":
+            date = task.created
+        else:
+            raise TypeError("Unknown state '%s'" % taskState)
+        if not date:
+            return False
+        if dateFrom and date < dateFrom:
+            return False
+        if dateTo and date > dateTo:
+            return False
+
+    return True
+
+
+def _jw_store_search(query):
+    return jw_search(query, expand="changelog")
+
+
+def _jw_store_tasks(params, taskCount=None, **kwargs):
+    context = jw_context()
+    store = context.store
+    if not params.offline:
+        count = store.sync(_jw_store_search, 'project=%s' % context.project, jw_timezone())
+        if params.showVerbose:
+            print("> synced %u tasks" % count)
+
+    predicate = jwtasks.TasksFilter().parse(params.taskFilter).compile()
+    sprintField = _jw_record_sprint_field()
+    found = 0
+    for raw in store.issues():
+        task = jwrecords.TaskRecord(raw, sprintField, context.target)
+        if not predicate(task) or not _jw_task_match(task, **kwargs):
+            continue
+        yield task
+        found += 1
+        if taskCount and found >= taskCount:
+            break
+
+
+def _jw_records(pages):
+    target = jw_context().target
+    sprintField = _jw_record_sprint_field()
+    for page in pages:
+        for raw in page:
+            yield jwrecords.TaskRecord(raw, sprintField, target)
+
+
+def jw_tasks(params, version=None, sprint=None, dateFrom=None, dateTo=None, taskState="updated", taskCount=None):
+    """
+    Returns list of tasks, or generator of them when streaming.
+    """
+    context = jw_context()
+    if context.store:
+        tasks = _jw_store_tasks(params, version=version, sprint=sprint,
+                                dateFrom=dateFrom, dateTo=dateTo,
+                                taskState=taskState, taskCount=taskCount)
+        return tasks if params.taskStream else list(tasks)
+
     items = []
-    items.append('project=%s' % jira_project)
+    items.append('project=%s' % context.project)
     if version:
         items.append('fixVersion="%s"' % version)
     if sprint:
         items.append('sprint="%s"' % sprint)
     if dateFrom:
-        if taskState == "updated":
+        if taskState == "updated" or taskState == "active":
             items.append('updated>="%s"' % dateFrom.strftime("%Y-%m-%d %H:%M"))
         elif taskState == "resolved":
             items.append('resolved>="%s"' % dateFrom.strftime("%Y-%m-%d %H:%M"))
@@ -115,13 +623,16 @@ def jw_tasks(params, version=None, sprint=None, dateFrom=None, dateTo=None, task
             items.append('updated<="%s"' % dateTo.strftime("%Y-%m-%d %H:%M"))
         elif taskState == "resolved":
             items.append('resolved<="%s"' % dateTo.strftime("%Y-%m-%d %H:%M"))
-        elif taskState == "created":
+        elif taskState == "created" or taskState == "active":
             items.append('created<="%s"' % dateTo.strftime("%Y-%m-%d %H:%M"))
         else:
             raise TypeError("Unknown state '%s'" % taskState)
 
     taskExpand = None
+    taskFields = None
     if params:
+        taskFields = params.taskFields
+
         for fgroup in params.taskFilter or []:
             flist = []
             for ftype, fvalue in fgroup:
@@ -129,21 +640,24 @@ def jw_tasks(params, version=None, sprint=None, dateFrom=None, dateTo=None, task
                     flist.append('issuetype="%s"' % fvalue)
                 elif ftype == 'state':
                     if fvalue == "Incomplete":
-                        flist.append('(status!="Closed" AND status!="Done" AND status!="Resolved")')
-                    elif fvalue == "Complete":
-                        flist.append('(status="Closed" OR status="Done" OR status="Resolved")')
-                    elif fvalue == "Working":
-                        flist.append('(status="In Progress" OR status="In Review")')
-                    elif fvalue == "Pending":
-                        flist.append('(status="Open" OR status="Paused" OR status="To Do" OR status="Reopened")')
+                        flist.append('(%s)' % " AND ".join(['status!="%s"' % name for name in jwprops.taskStates["Complete"]]))
+                    elif fvalue in jwprops.taskStates:
+                        flist.append('(%s)' % " OR ".join(['status="%s"' % name for name in jwprops.taskStates[fvalue]]))
                     else:
                         flist.append('status="%s"' % fvalue)
 
             if len(flist) > 0:
                 items.append("(%s)" % " OR ".join(flist))
 
+        if jw_changed_pushdown():
+            if params.taskChangeStatus:
+                items.append(_jw_changed("status", dateFrom, dateTo))
+            if params.taskChangeResolution:
+                items.append(_jw_changed("resolution", dateFrom, dateTo))
         # Expand changelog when history is needed
-        if params.taskChangeStatus or params.taskChangeResolution:
+        elif params.taskChangeStatus or params.taskChangeResolution:
+            taskExpand = "changelog"
+        if params.showCycleTime or params.showThroughput:
             taskExpand = "changelog"
 
     searchQuery = " AND ".join(items)
@@ -151,13 +665,85 @@ def jw_tasks(params, version=None, sprint=None, dateFrom=None, dateTo=None, task
     if params.showVerbose:
         print(">", searchQuery)
 
-    return jira.search_issues(searchQuery,
-                              maxResults=taskCount,
-                              expand=taskExpand)
-
-
-def jw_tasks_by_key(key):
-    return jira.issue(key, expand='changelog')
+    if params and params.taskStream:
+        return _jw_records(jw_search_pages(searchQuery, fields=taskFields, expand=taskExpand, count=taskCount))
+
+    issues = jw_search(searchQuery, fields=taskFields, expand=taskExpand, count=taskCount)
+    with jwtiming.phase("records"):
+        return list(_jw_records([issues]))
+
+
+@jwtiming.timed("search-keys")
+def _jw_search_keys(keys, fields=None, expand=None):
+    """
+    Look keys up in chunked 'key in (...)' searches run concurrently.
+    Returns raw issues in input order and keys not found.
+    """
+    keys = [key.upper() for key in keys]
+    found = {}
+    context = jw_context()
+    if context.store and context.params.offline:
+        for key in keys:
+            raw = context.store.issue(key)
+            if raw:
+                found[key] = raw
+    else:
+        size = jw_page_size()
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+
+        def fetch(chunk):
+            query = "key in (%s)" % ",".join('"%s"' % key for key in chunk)
+            # Unknown keys would fail validated query as a whole
+            return _jw_search_all(query, fields, expand, validate=False)
+
+        def fetch_one(key):
+            from jira.exceptions import JIRAError
+            try:
+                return _jw_jira()._get_json("issue/%s" % key, params={
+                    "fields": ",".join(fields) if fields else "*all",
+                    "expand": expand,
+                })
+            except JIRAError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=jw_workers()) as executor:
+            for issues in executor.map(jw_bind(fetch), chunks):
+                for raw in issues:
+                    found[raw["key"]] = raw
+
+            # Issues moved to another project are found under their new
+            # key, issue lookup follows the old one
+            rest = [key for key in keys if key not in found]
+            for key, raw in zip(rest, executor.map(jw_bind(fetch_one), rest)):
+                if raw:
+                    found[key] = raw
+
+    issues = [found[key] for key in keys if key in found]
+    missing = [key for key in keys if key not in found]
+    return issues, missing
+
+
+def jw_issues_by_keys(keys):
+    """
+    Full python-jira issue resources, for inspection.
+    """
+    from jira.resources import Issue
+
+    issues, missing = _jw_search_keys(keys, expand="changelog")
+    return [Issue({}, None, raw=raw) for raw in issues], missing
+
+
+def jw_tasks_by_keys(keys, params):
+    expand = None
+    # List lookups filter changes locally
+    if params.taskChangeStatus or params.taskChangeResolution or params.showCycleTime:
+        expand = "changelog"
+
+    issues, missing = _jw_search_keys(keys, params.taskFields, expand)
+    sprintField = _jw_record_sprint_field()
+    target = jw_context().target
+    with jwtiming.phase("records"):
+        return [jwrecords.TaskRecord(raw, sprintField, target) for raw in issues], missing
 
 
 def jw_tasks_by_precedence(count, params):
@@ -171,6 +757,14 @@ def jw_tasks_by_date(taskState, dateFrom, dateTo, params):
     return jw_tasks(params, dateFrom=dateFrom, dateTo=dateTo, taskState=taskState)
 
 
+def jw_tasks_by_activity(dateFrom, dateTo, params):
+    """
+    Tasks created, resolved or changed within the period, i.e. updated
+    since its start and created by its end.
+    """
+    return jw_tasks(params, dateFrom=dateFrom, dateTo=dateTo, taskState="active")
+
+
 def jw_tasks_by_sprint(sprint, params):
     if not sprint:
         raise TypeError("No sprint")
@@ -1,3 +1,14 @@
 
+import sys
+
+
+# Set when stdout carries exported data, messages go to stderr then
+data = False
+
+
 def warn(msg, *args):
-    print(msg % args)
+    print(msg % args, file=sys.stderr if data else sys.stdout)
+
+
+def info(msg, *args):
+    print(msg % args, file=sys.stderr if data else sys.stdout)
@@ -43,15 +43,39 @@ class ValueRange(argparse.Action):
 def parse():
     parser = argparse.ArgumentParser(description='JIRA issues filter')
 
-    parser.add_argument('project', type=str, nargs='?',
-                        help='configured JIRA project')
+    parser.add_argument('project', type=str, nargs='*',
+                        help='configured JIRA projects, "all" for every one')
 
     parser.add_argument('--verbose', const=True,
                         action='store_const', dest='showVerbose',
                         help='verbose print')
     parser.add_argument('--inspect', nargs='?', type=str, const=True,
                         action='store', dest='showInspect',
-                        help='inspect data')
+                        help='inspect data, tasks by comma separated keys')
+    parser.add_argument('--offline', const=True,
+                        action='store_const', dest='offline',
+                        help='serve tasks from local store only')
+    parser.add_argument('--refresh', const=True,
+                        action='store_const', dest='refresh',
+                        help='refetch cached boards, sprints and versions')
+    parser.add_argument('--timing', const=True,
+                        action='store_const', dest='showTiming',
+                        help='show startup timing on stderr')
+    parser.add_argument('--profile', nargs='?', type=str, const=True, metavar='TRACE',
+                        action='store', dest='showProfile',
+                        help='show phases with requests made, or write JSON trace')
+    parser.add_argument('--cprofile', type=str, metavar='FILE',
+                        action='store', dest='profileDump',
+                        help='dump cProfile stats into file')
+    parser.add_argument('--daemon', const=True,
+                        action='store_const', dest='daemonServe',
+                        help='serve requests on local socket')
+    parser.add_argument('--no-daemon', const=True,
+                        action='store_const', dest='daemonSkip',
+                        help='do not forward request to daemon')
+    parser.add_argument('--workers', type=int, metavar='COUNT',
+                        action='store', dest='fetchWorkers',
+                        help='number of concurrent requests')
 
     group_detail = parser.add_mutually_exclusive_group(required=False)
     group_detail.add_argument('--show-brief',
@@ -84,7 +108,7 @@ def parse():
     group_lookup.add_argument('--for-period',
                               action='store_true', dest='lookupPeriod',
                               help='for specified period')
-    group_lookup.add_argument('--limit', nargs=1, type=int, default=10,
+    group_lookup.add_argument('--limit', type=int, default=10,
                               action='store', dest='lookupLimit',
                               help='limit number of results')
     group_lookup.add_argument('--list', nargs='+',
@@ -168,8 +192,28 @@ def parse():
                                 action='append_const', help='group tasks by "sprint"')
     group_grouping.add_argument('--group-version', dest='taskGroup', const='version',
                                  action='append_const', help='group tasks by "version"')
+    group_grouping.add_argument('--group-target', dest='taskGroup', const='target',
+                                action='append_const', help='group tasks by "target"')
+    group_grouping.add_argument('--merge', dest='taskMerge', const=True,
+                                action='store_const', help='merge tasks of several targets, grouped by target')
+
+    group_analytics = parser.add_argument_group('Tasks analytics options', 'Effective only with --tasks option')
+    group_analytics.add_argument('--throughput', nargs='?', const='week', choices=['day', 'week'],
+                                 action='store', dest='showThroughput', metavar='PERIOD',
+                                 help='count created, resolved and updated tasks per "day" or "week" of the period')
+    group_analytics.add_argument('--cycle-time', const=True,
+                                 action='store_const', dest='showCycleTime',
+                                 help='show lead, cycle and in-status time percentiles from changelogs')
 
     group_printing = parser.add_argument_group('Tasks printing options', 'Effective only with --tasks option')
+    group_printing.add_argument('--stream', dest='taskStream', const=True,
+                                action='store_const', help='print tasks as they are fetched, unless grouped')
+    group_printing.add_argument('--count', dest='showCount', const=True,
+                                action='store_const', help='print group counts instead of tasks')
+    group_printing.add_argument('--format', dest='taskFormat', choices=['jsonl', 'csv', 'arrow'],
+                                action='store', help='export tasks as JSON lines, CSV or Arrow stream')
+    group_printing.add_argument('--output', dest='taskOutput', metavar='FILE',
+                                action='store', help='write exported tasks into file')
     group_printing.add_argument('--print-key', dest='taskPrint', const='key',
                                 action='append_const', help='print task "key"')
     group_printing.add_argument('--print-type', dest='taskPrint', const='type',
@@ -186,6 +230,8 @@ def parse():
                                 action='append_const', help='print task "sprint"')
     group_printing.add_argument('--print-version', dest='taskPrint', const='version',
                                  action='append_const', help='print task "version"')
+    group_printing.add_argument('--print-target', dest='taskPrint', const='target',
+                                action='append_const', help='print task "target"')
 
     params = parser.parse_args()
     return params
@@ -1,54 +1,75 @@
-
 import re
 
+
+# Legacy greenhopper sprint string:
+#   com.atlassian.greenhopper.service.sprint.Sprint@1f[id=1,...,name=Sprint 1,...]
+SPRINT_CLASS = "com.atlassian.greenhopper.service.sprint.Sprint"
+SPRINT_NAME = re.compile(r"\[(?:[^\]]*?,)?name=([^,\]]+)")
+
+# Status names grouped into the --state-* filter categories
+taskStates = {
+    "Complete": ("Closed", "Done", "Resolved"),
+    "Working": ("In Progress", "In Review"),
+    "Pending": ("Open", "Paused", "To Do", "Reopened"),
+}
+
+
 def taskVersions(task, default=None):
-    versions = []
-    for version in task.fields.fixVersions:
-        versions.append(version.name)
+    versions = task.versions
 
     if not default:
-        return versions
+        return list(versions)
     if default == True:
         return versions[0] if len(versions) > 0 else "None"
     else:
         return default
 
 
-def taskSprints(task, default=None):
-    sprints_def = None
-    for key, val in task.fields.__dict__.items():
-        if type(val) != list or len(val) == 0 or type(val[0]) != str:
-            continue
+def isSprints(val):
+    if type(val) != list or len(val) == 0:
+        return False
+    if type(val[0]) == str:
+        return val[0].startswith(SPRINT_CLASS)
+    if type(val[0]) == dict:
+        return "boardId" in val[0] and "name" in val[0]
+    return False
+
 
-        if not re.search("com.atlassian.greenhopper.service.sprint.Sprint", val[0]):
-            continue
+def findSprints(fields):
+    """
+    Find sprint custom field values among raw issue fields, when the
+    sprint field id is not known.
+    """
+    for key, val in fields.items():
+        if key.startswith("customfield_") and isSprints(val):
+            return val
 
-        sprints_def = val
-        break
+    return None
 
-    if not sprints_def:
-        sprints_def = []
 
+def parseSprints(sprints_def):
+    """
+    Sprint names from either legacy string or sprint object values.
+    """
     sprints = []
-    for sd in sprints_def:
-        content = re.match(".*?\[(.+?)\].*?", sd)
-        if not content:
-            continue
+    for sd in sprints_def or []:
+        if type(sd) == dict:
+            name = sd.get("name")
+        else:
+            content = SPRINT_NAME.search(sd)
+            name = content.group(1) if content else None
 
-        name = re.search("name=([^,]+)", content.group(1))
-        if not name:
-            continue
+        if name:
+            sprints.append(name)
 
-        sprints.append(name.group(1))
+    return sprints
 
-        # XXX: in case we would need all springs info
-        #sprint = {}
-        #for item in re.finditer("(\w+)=([^,]+),?", content.group(1)):
-        #    sprint[item.group(1)] = item.group(2)
-        #sprints.append(sprint)
+
+def taskSprints(task, default=None):
+    sprints = task.sprints
 
     if not default:
-        return sprints
+        return list(sprints)
     if default == True:
         return sprints[0] if len(sprints) > 0 else "None"
     else:
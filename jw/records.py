@@ -0,0 +1,134 @@
+
+import sys
+import datetime
+from bisect import bisect_left, bisect_right
+
+from . import properties as jwprops
+
+
+def parseDate(value):
+    """
+    Parse JIRA timestamp into naive datetime, zone is dropped the same
+    way as elsewhere in jw.
+    """
+    if not value:
+        return None
+    try:
+        date = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        date = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    return date.replace(tzinfo=None)
+
+
+def _minute(date):
+    return date.replace(second=0, microsecond=0)
+
+
+def _name(value, attr="name"):
+    if not value:
+        return None
+    return sys.intern(value[attr])
+
+
+class Changelog:
+    """
+    Changelog records sorted by time, indexed by record minute and by
+    changed field for range lookups.
+    """
+
+    __slots__ = ('records', 'minutes', 'fields')
+
+    def __init__(self, records):
+        records = sorted(records, key=lambda record: record[0])
+        self.records = tuple(records)
+        self.minutes = [_minute(record[0]) for record in records]
+        self.fields = {}
+        for pos, record in enumerate(records):
+            for item in record[2]:
+                positions = self.fields.setdefault(item[0], [])
+                if not positions or positions[-1] != pos:
+                    positions.append(pos)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def transitions(self, field):
+        """
+        Generate (created, fromString, toString) of field changes in time
+        order.
+        """
+        for pos in self.fields.get(field, ()):
+            created, author, items = self.records[pos]
+            for item in items:
+                if item[0] == field:
+                    yield created, item[1], item[2]
+
+    def changed(self, field, dateFrom=None, dateTo=None):
+        """
+        Whether field changed within [dateFrom, dateTo], both bounds
+        taken to the minute like JQL CHANGED DURING does.
+        """
+        positions = self.fields.get(field)
+        if not positions:
+            return False
+        lo = bisect_left(self.minutes, _minute(dateFrom)) if dateFrom else 0
+        hi = bisect_right(self.minutes, _minute(dateTo)) if dateTo else len(self.minutes)
+        pos = bisect_left(positions, lo)
+        return pos < len(positions) and positions[pos] < hi
+
+
+class TaskRecord:
+    """
+    Compact task built straight from search JSON. Changelog is kept
+    only when expanded, as indexed (created, author, items) records
+    with items being (field, fromString, toString).
+    """
+
+    __slots__ = ('id', 'key', 'type', 'status', 'assignee', 'reporter',
+                 'summary', 'versions', 'created', 'updated', 'resolved',
+                 'changelog', 'target', '_sprints', '_sprintsDef')
+
+    def __init__(self, raw, sprintField=None, target=None):
+        fields = raw.get("fields") or {}
+
+        self.target = target
+        self.id = raw["id"]
+        self.key = raw["key"]
+        self.type = _name(fields.get("issuetype"))
+        self.status = _name(fields.get("status"))
+        self.assignee = _name(fields.get("assignee"), "displayName")
+        self.reporter = _name(fields.get("reporter"), "displayName")
+        self.summary = fields.get("summary")
+        self.versions = tuple(_name(version) for version in fields.get("fixVersions") or ())
+        # Sprints are parsed on first use
+        self._sprints = None
+        if sprintField:
+            self._sprintsDef = fields.get(sprintField)
+        else:
+            self._sprintsDef = jwprops.findSprints(fields)
+        self.created = parseDate(fields.get("created"))
+        self.updated = parseDate(fields.get("updated"))
+        self.resolved = parseDate(fields.get("resolutiondate"))
+
+        changelog = raw.get("changelog")
+        if changelog is None:
+            self.changelog = None
+        else:
+            self.changelog = Changelog((parseDate(history["created"]),
+                                        _name(history.get("author"), "displayName"),
+                                        tuple((sys.intern(item["field"]), item.get("fromString"), item.get("toString"))
+                                              for item in history["items"]))
+                                       for history in changelog["histories"])
+
+    @property
+    def sprints(self):
+        if self._sprints is None:
+            self._sprints = tuple(sys.intern(name) for name in jwprops.parseSprints(self._sprintsDef))
+            self._sprintsDef = None
+        return self._sprints
+
+    def __repr__(self):
+        return "<TaskRecord %s>" % self.key
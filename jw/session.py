@@ -0,0 +1,48 @@
+
+import os
+import json
+import atexit
+
+
+def path(config):
+    if config.session:
+        return os.path.expanduser(config.session)
+    if os.getenv("HOME"):
+        return os.getenv("HOME") + "/.jw.session"
+    return "jw.session"
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load(path, key):
+    return _read(path).get(key, {})
+
+
+def save(path, key, cookies):
+    sessions = _read(path)
+    if sessions.get(key) == cookies:
+        return
+    sessions[key] = cookies
+    try:
+        # Session cookies are credentials, keep them private
+        fd = os.open(path + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(sessions, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+
+def track(path, key, session):
+    """
+    Store session cookies on exit so the next run reuses the server
+    side session. Key tells apart servers and accounts, cookies of
+    one must never be sent to another.
+    """
+    atexit.register(lambda: save(path, key, session.cookies.get_dict()))
@@ -1,10 +1,11 @@
 
 from datetime import datetime
-from termcolor import colored
 from . import fetch as jwfetch
 
 
 def run():
+    from termcolor import colored
+
     sprints = jwfetch.jw_sprints()
 
     dateNow = datetime.now().replace(tzinfo=None)
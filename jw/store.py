@@ -0,0 +1,98 @@
+
+import os
+import json
+import sqlite3
+import datetime
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    target TEXT NOT NULL,
+    key TEXT NOT NULL,
+    updated TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (target, key)
+);
+CREATE TABLE IF NOT EXISTS targets (
+    target TEXT PRIMARY KEY,
+    watermark TEXT
+);
+"""
+
+# JQL dates have minute resolution; overlap consecutive syncs to not
+# lose updates made within the minute of the watermark.
+SYNC_OVERLAP = datetime.timedelta(minutes=5)
+
+
+def _updated(issue):
+    return datetime.datetime.strptime(issue["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def path(config):
+    if config.store:
+        return os.path.expanduser(config.store)
+    if os.getenv("HOME"):
+        return os.getenv("HOME") + "/.jw.db"
+    return "jw.db"
+
+
+class Store:
+
+    def __init__(self, path, target):
+        self.path = path
+        self.target = target
+        # Resident process may use the store from different threads
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    def watermark(self):
+        row = self.db.execute("SELECT watermark FROM targets WHERE target=?",
+                              (self.target,)).fetchone()
+        if not row or not row[0]:
+            return None
+        return datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M")
+
+    def update(self, issues, watermark):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO issues (target, key, updated, data) VALUES (?, ?, ?, ?)",
+                                [(self.target, issue["key"], issue["fields"].get("updated"), json.dumps(issue))
+                                 for issue in issues])
+            if watermark:
+                self.db.execute("INSERT OR REPLACE INTO targets (target, watermark) VALUES (?, ?)",
+                                (self.target, watermark.strftime("%Y-%m-%d %H:%M")))
+
+    def sync(self, searchFn, query, tz=None):
+        """
+        Pull issues updated since last sync; searchFn(jql) must return
+        raw issue dicts with changelog expanded. Watermark is the latest
+        update pulled, in tz JQL dates are evaluated in (local if None),
+        so client clock does not matter.
+        """
+        watermark = self.watermark()
+        if watermark:
+            query = '%s AND updated>="%s"' % (query, (watermark - SYNC_OVERLAP).strftime("%Y-%m-%d %H:%M"))
+
+        issues = searchFn(query)
+        dates = [_updated(issue) for issue in issues if issue["fields"].get("updated")]
+        if dates:
+            latest = max(dates).astimezone(tz).replace(tzinfo=None, second=0, microsecond=0)
+            if not watermark or latest > watermark:
+                watermark = latest
+        self.update(issues, watermark)
+        return len(issues)
+
+    def issues(self):
+        cursor = self.db.execute("SELECT data FROM issues WHERE target=? ORDER BY updated DESC",
+                                 (self.target,))
+        for row in cursor:
+            yield json.loads(row[0])
+
+    def issue(self, key):
+        row = self.db.execute("SELECT data FROM issues WHERE target=? AND key=?",
+                              (self.target, key)).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0])
+
+    def close(self):
+        self.db.close()
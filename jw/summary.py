@@ -1,24 +1,33 @@
 
+from concurrent.futures import ThreadPoolExecutor
 from . import fetch as jwfetch
 
 
 def run():
-    print("Projects:\n")
-    projects = jwfetch.jw_projects()
-    for project in projects:
-        print("* %s - %s" % (project.key, project.name,))
-        versions = jwfetch.jw_versions(project)
-        if len(versions) == 0:
-            continue
-        print("\n  - %s\n" % "\n  - ".join([version.name for version in jwfetch.jw_versions(project)]))
+    # One request per resource on a shared pool; results are printed
+    # in listing order as soon as each of them is available.
+    with ThreadPoolExecutor(max_workers=jwfetch.jw_workers()) as executor:
+        projects = executor.submit(jwfetch.jw_bind(jwfetch.jw_projects))
+        boards = executor.submit(jwfetch.jw_bind(jwfetch.jw_boards))
 
-    print()
-    print("Boards:\n")
-    boards = jwfetch.jw_boards()
-    for board in boards:
-        print("* %s" % (board.name,))
-        sprints = jwfetch.jw_sprints(board)
-        if len(sprints) == 0:
-            continue
-        print("\n  - %s\n" % "\n  - ".join([sprint.name for sprint in jwfetch.jw_sprints(board)]))
+        versions = [(project, executor.submit(jwfetch.jw_bind(jwfetch.jw_versions), project))
+                    for project in projects.result()]
+        sprints = [(board, executor.submit(jwfetch.jw_bind(jwfetch.jw_sprints), board))
+                   for board in boards.result()]
 
+        print("Projects:\n")
+        for project, future in versions:
+            print("* %s - %s" % (project.key, project.name,))
+            items = future.result()
+            if len(items) == 0:
+                continue
+            print("\n  - %s\n" % "\n  - ".join([version.name for version in items]))
+
+        print()
+        print("Boards:\n")
+        for board, future in sprints:
+            print("* %s" % (board.name,))
+            items = future.result()
+            if len(items) == 0:
+                continue
+            print("\n  - %s\n" % "\n  - ".join([sprint.name for sprint in items]))
@@ -1,6 +1,6 @@
 
 import sys
-import datetime
+from . import timing as jwtiming
 from . import properties as jwprops
 
 def all(*args):
@@ -10,121 +10,90 @@ def all(*args):
     return result
 
 
-def checkRecordDate(record, dateFrom, dateTo):
-    dateStr = record.created.split('T')[0]
-    dateRec = datetime.datetime.strptime(dateStr, "%Y-%m-%d")
-    if dateFrom and dateFrom > dateRec:
-        return False
-    if dateTo and dateTo < dateRec:
-        return False
-    return True
+class FilterChanged:
 
-
-def getRecordField(record, field):
-    for item in record.items:
-        if item.field == field:
-            return item
-    return None
-
-
-class FilterChangedStatus:
+    field = None
 
     def __init__(self, dateFrom, dateTo):
         self.dateFrom = dateFrom
         self.dateTo = dateTo
 
-    def digest(self, tasks):
-        filtered = []
+    def match(self, task):
+        if not task.changelog:
+            return False
+        return task.changelog.changed(self.field, self.dateFrom, self.dateTo)
+
+    def iterate(self, tasks):
         for task in tasks:
-            found = False
-            for record in task.changelog.histories:
-                if not checkRecordDate(record, self.dateFrom, self.dateTo):
-                    continue
+            if self.match(task):
+                yield task
 
-                if not getRecordField(record, "status"):
-                    continue
+    def digest(self, tasks):
+        return list(self.iterate(tasks))
 
-                found = True
-                break
-            if found:
-                filtered.append(task)
 
-        return filtered
+class FilterChangedStatus(FilterChanged):
 
+    field = "status"
 
-class FilterChangedResolution:
 
-    def __init__(self, dateFrom, dateTo):
-        self.dateFrom = dateFrom
-        self.dateTo = dateTo
+class FilterChangedResolution(FilterChanged):
 
-    def digest(self, tasks):
-        filtered = []
-        for task in tasks:
-            for record in task.changelog.histories:
-                if not checkRecordDate(record, self.dateFrom, self.dateTo):
-                    continue
+    field = "resolution"
 
-                if not getRecordField(record, "resolution"):
-                    continue
 
-                filtered.append(task)
-                break
+class TasksCounter:
 
-        return filtered
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.count = 0
+
+    def __iter__(self):
+        for task in self.tasks:
+            self.count += 1
+            yield task
 
 
 class FilterByType:
 
     def __init__(self, name):
         self.taskType = name
+        self.attr = 'type'
+        self.values = frozenset([name])
+        self.negate = False
 
-    def run(self, data):
-        filtered = []
-        for task in data:
-            if self.taskType == "Bug" and task.fields.issuetype.name != "Bug":
-                continue
-            elif self.taskType == "Technical Story" and task.fields.issuetype.name != "Technical Story":
-                continue
-            elif self.taskType == "User Story" and task.fields.issuetype.name != "User Story":
-                continue
-            elif self.taskType == "Support Task" and task.fields.issuetype.name != "Support Task":
-                continue
-            elif self.taskType == "Epic" and task.fields.issuetype.name != "Epic":
-                continue
-
-            filtered.append(task)
+    def match(self, task):
+        return task.type in self.values
 
-        return filtered
+    def run(self, data):
+        return [task for task in data if self.match(task)]
 
 
 class FilterByState:
 
-    def __init__(self, name):
-        self.taskState = name
-
     """
     Filters tasks by state:
-        - Open -- Tasks that are not "Done"; "In Review" is not done!
-        - Done -- Tasks that are fully finished; review and testing included!
+        - Incomplete -- Tasks that are not yet done.
+        - Complete -- Tasks that are fully done; review and testing included!
         - Working -- Tasks currenly work in progress.
         - Pending -- Tasks that were not started yet.
+    Any other name is matched as plain status name.
     """
-    def run(self, data):
-        filtered = []
-        for task in data:
-            if self.taskState == "Open" and task.fields.status.name == "Closed":
-                continue
-            elif self.taskState == "Done" and task.fields.status.name != "Closed":
-                continue
-            elif self.taskState == "Working" and (task.fields.status.name != "In Progress" and task.fields.status.name != "In Review"):
-                continue
-            elif self.taskState == "Pending" and (task.fields.status.name != "Open" and task.fields.status.name != "Paused"):
-                continue
+    def __init__(self, name):
+        self.taskState = name
+        self.attr = 'status'
+        if name == "Incomplete":
+            self.values = frozenset(jwprops.taskStates["Complete"])
+            self.negate = True
+        else:
+            self.values = frozenset(jwprops.taskStates.get(name, (name,)))
+            self.negate = False
 
-            filtered.append(task)
+    def match(self, task):
+        return (task.status in self.values) != self.negate
 
-        return filtered
+    def run(self, data):
+        return [task for task in data if self.match(task)]
 
 
 class TasksFilter:
@@ -136,15 +105,50 @@ class TasksFilter:
         self.do_filter.append(args)
         return self
 
-    def digest(self, tasks):
+    def parse(self, taskFilter):
+        """
+        Add filter groups as collected by --type-*, --state-* and --or.
+        """
+        for fgroup in taskFilter or []:
+            self.add(*[FilterByType(fvalue) if ftype == 'type' else FilterByState(fvalue)
+                       for ftype, fvalue in fgroup])
+        return self
+
+    def compile(self):
+        """
+        Compile AND of OR groups into single task predicate. Same
+        attribute filters of a group are merged into one value set.
+        """
+        plan = []
         for item_and in self.do_filter:
-            found = []
+            positive = {}
+            negative = []
             for item_or in item_and:
-                found.extend([rv for rv in item_or.run(tasks) if rv not in found])
-            tasks = found
+                if item_or.negate:
+                    negative.append((item_or.attr, item_or.values))
+                else:
+                    positive[item_or.attr] = positive.get(item_or.attr, frozenset()) | item_or.values
+            plan.append((tuple(positive.items()), tuple(negative)))
+
+        def predicate(task):
+            for positive, negative in plan:
+                if any(getattr(task, attr) in values for attr, values in positive):
+                    continue
+                if any(getattr(task, attr) not in values for attr, values in negative):
+                    continue
+                return False
+            return True
 
-        return tasks
-        propFn = buildPropertyFn(name)
+        return predicate
+
+    def iterate(self, tasks):
+        predicate = self.compile()
+        for task in tasks:
+            if predicate(task):
+                yield task
+
+    def digest(self, tasks):
+        return list(self.iterate(tasks))
 
 
 class GroupBuilder:
@@ -153,25 +157,22 @@ class GroupBuilder:
         self.propFn = propFn
         self.showFn = showFn
 
-    def iterate(self, tasks):
-        groups = {}
-        for task in tasks:
-            prop = self.propFn(task)
-            if prop not in groups:
-                groups[prop] = []
-            groups[prop].append(task)
-
-        for group in groups.values():
-            yield group
-
-    def display(self, tasks):
+    def display(self, group):
         if not self.showFn:
             return
-        if len(tasks) == 0:
-            return
-        task = tasks[0]
-        prop = self.propFn(task)
-        self.showFn(task, prop)
+        self.showFn(group.first, group.prop)
+
+
+class Group:
+
+    __slots__ = ('prop', 'first', 'count', 'items')
+
+    def __init__(self, prop, first):
+        self.prop = prop
+        self.first = first
+        self.count = 0
+        # Sub-groups by property, or tasks on the last level
+        self.items = None
 
 
 class GroupPrinter:
@@ -182,6 +183,11 @@ class GroupPrinter:
     def __call__(self, tasks):
         if not tasks:
             return
+        # Printers rendering many tasks at once take them all
+        write = getattr(self.showFn, 'write', None)
+        if write:
+            write(tasks)
+            return
         for task in tasks:
             self.showFn(task)
 
@@ -191,6 +197,7 @@ class TasksGroups:
     def __init__(self):
         self.do_group = []
         self.do_print = None
+        self.do_count = None
 
     def group(self, propFn, showFn=None):
         self.do_group.append(GroupBuilder(propFn, showFn))
@@ -200,36 +207,88 @@ class TasksGroups:
         self.do_print = GroupPrinter(showFn)
         return self
 
+    def count(self, showFn):
+        """
+        Show group counts instead of printing tasks.
+        """
+        self.do_count = showFn
+        return self
+
+    def build(self, tasks):
+        """
+        Single pass over tasks: group keys are computed once per task
+        and counted on every level of the nested groups.
+        """
+        root = Group(None, None)
+        last = len(self.do_group) - 1
+        for task in tasks:
+            node = root
+            node.count += 1
+            for depth, group in enumerate(self.do_group):
+                prop = group.propFn(task)
+                if node.items is None:
+                    node.items = {}
+                child = node.items.get(prop)
+                if child is None:
+                    child = node.items[prop] = Group(prop, task)
+                    if depth == last:
+                        child.items = []
+                child.count += 1
+                node = child
+            if last >= 0:
+                node.items.append(task)
+        return root
+
     def digest(self, tasks):
-        self.__dive(0, tasks)
+        if not self.do_group:
+            with jwtiming.phase("print"):
+                if self.do_count:
+                    # All tasks make the single ungrouped row
+                    self.do_count(0, "Tasks", sum(1 for task in tasks))
+                else:
+                    self.do_print(tasks)
+            return
 
-    def __dive(self, depth, ilist):
-        if len(self.do_group) <= depth:
-            self.do_print(ilist)
+        with jwtiming.phase("group"):
+            root = self.build(tasks)
+        with jwtiming.phase("print"):
+            self.__walk(0, root)
+
+    def __walk(self, depth, node):
+        if depth == len(self.do_group):
+            if not self.do_count:
+                self.do_print(node.items)
             return
 
         group = self.do_group[depth]
-        # Guard from non-generators
-        ogroups = group.iterate(ilist)
-        if not ogroups:
-            return
+        for child in node.items.values():
+            if self.do_count:
+                self.do_count(depth, child.prop, child.count)
+            else:
+                group.display(child)
+            self.__walk(depth + 1, child)
+
+
+# Rows rendered per write of the printer, when not streaming
+CHUNK = 512
 
-        for olist in ogroups:
-            group.display(olist)
-            self.__dive(depth + 1, olist)
+
+def _mapped(getter, propFn):
+    return lambda task: propFn(getter(task), task)
 
 
 class TasksPrinter:
 
     types = {
         'key': lambda task: task.key,
-        'type': lambda task: task.fields.issuetype.name,
-        'status': lambda task: task.fields.status.name,
-        'assignee': lambda task: task.fields.assignee.displayName,
-        'reporter': lambda task: task.fields.reporter.displayName,
-        'summary': lambda task: task.fields.summary,
+        'type': lambda task: task.type,
+        'status': lambda task: task.status,
+        'assignee': lambda task: task.assignee or "Unassigned",
+        'reporter': lambda task: task.reporter or "None",
+        'summary': lambda task: task.summary,
         'sprint': lambda task: jwprops.taskSprints(task, True),
         'version': lambda task: jwprops.taskVersions(task, True),
+        'target': lambda task: task.target,
     }
 
     sizes = {
@@ -241,33 +300,71 @@ class TasksPrinter:
         'summary': '%-50s',
         'sprint': '%-30s',
         'version': '%-30s',
+        'target': '%-12s',
     }
 
-    extra = {}
-
-    def __init__(self):
+    def __init__(self, chunk=CHUNK):
         self.columns = []
-
-    def __call__(self, task):
+        self.chunk = chunk
+        # Own copies, mappings of one printer do not leak into others
+        self.types = dict(TasksPrinter.types)
+        self.sizes = dict(TasksPrinter.sizes)
+        self.extra = {}
+        self.row = None
+
+    def compile(self):
+        """
+        Build per-row formatter of chosen columns: one format string
+        and a getter per column, mappings applied.
+        """
+        fmt = "".join(self.sizes[column] for column in self.columns) + "\n"
+        getters = []
         for column in self.columns:
+            getter = self.types[column]
             if column in self.extra:
-                sys.stdout.write(self.sizes[column] % self.extra[column](self.types[column](task), task))
-            else:
-                sys.stdout.write(self.sizes[column] % self.types[column](task))
-        sys.stdout.write('\n')
+                getter = _mapped(getter, self.extra[column])
+            getters.append(getter)
+
+        def row(task):
+            return fmt % tuple([getter(task) for getter in getters])
+
+        self.row = row
+        return row
+
+    def __call__(self, task):
+        sys.stdout.write((self.row or self.compile())(task))
+
+    def write(self, tasks):
+        """
+        Print tasks, rendered and written a chunk of rows at a time.
+        """
+        row = self.row or self.compile()
+        chunk = self.chunk
+        out = sys.stdout
+        rows = []
+        for task in tasks:
+            rows.append(row(task))
+            if len(rows) == chunk:
+                out.write("".join(rows))
+                rows = []
+        if rows:
+            out.write("".join(rows))
 
     def mapping(self, prop, propFn, propFmt):
         if propFn:
             self.extra[prop] = propFn
         if propFmt:
             self.sizes[prop] = propFmt
+        self.row = None
 
     def declare(self, prop, propFn, propFmt):
         self.types[prop] = propFn
-        self.types[prop] = propFmt
+        self.sizes[prop] = propFmt
+        self.row = None
 
     def default(self):
         self.columns = ['key', 'type', 'status', 'assignee', 'summary']
+        self.row = None
         return self
 
     def include(self, *args):
@@ -280,6 +377,7 @@ class TasksPrinter:
 
             self.columns.append(arg)
 
+        self.row = None
         return self
 
     def exclude(self, *args):
@@ -289,6 +387,7 @@ class TasksPrinter:
 
             self.columns.remove(arg)
 
+        self.row = None
         return self
 
 
@@ -301,6 +400,15 @@ class TasksStream:
         sys.stdout.write('%s ' % task.key)
 
 
+class TasksCount:
+
+    def __init__(self):
+        pass
+
+    def __call__(self, depth, prop, count):
+        sys.stdout.write('%s%-*s %6u\n' % ('  ' * depth, 40 - 2 * depth, prop, count))
+
+
 class TasksInline:
 
     def __init__(self):
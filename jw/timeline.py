@@ -0,0 +1,150 @@
+
+import bisect
+import datetime
+
+
+class Node:
+    """
+    Centered interval tree node: intervals spanning center, sorted by
+    start and by end, intervals wholly before or after it in children.
+    """
+
+    __slots__ = ('center', 'byStart', 'byEnd', 'left', 'right')
+
+    def __init__(self, intervals):
+        points = sorted(point for start, end, pos in intervals for point in (start, end))
+        self.center = points[len(points) // 2]
+        here, before, after = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                before.append(interval)
+            elif interval[0] > self.center:
+                after.append(interval)
+            else:
+                here.append(interval)
+        self.byStart = sorted(here, key=lambda interval: interval[0])
+        self.byEnd = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = Node(before) if before else None
+        self.right = Node(after) if after else None
+
+    def containing(self, date, found):
+        node = self
+        while node:
+            if date < node.center:
+                # All here end at center or later, those started count
+                for start, end, pos in node.byStart:
+                    if start > date:
+                        break
+                    found.append(pos)
+                node = node.left
+            elif date > node.center:
+                for start, end, pos in node.byEnd:
+                    if end < date:
+                        break
+                    found.append(pos)
+                node = node.right
+            else:
+                found.extend(pos for start, end, pos in node.byStart)
+                node = None
+        return found
+
+    def overlapping(self, dateFrom, dateTo, found):
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if dateTo < node.center:
+                # Here all end after dateTo, those started by it count
+                for start, end, pos in node.byStart:
+                    if start > dateTo:
+                        break
+                    found.append(pos)
+            elif dateFrom > node.center:
+                for start, end, pos in node.byEnd:
+                    if end < dateFrom:
+                        break
+                    found.append(pos)
+            else:
+                found.extend(pos for start, end, pos in node.byStart)
+            if node.left and dateFrom < node.center:
+                nodes.append(node.left)
+            if node.right and dateTo > node.center:
+                nodes.append(node.right)
+        return found
+
+
+class Timeline:
+    """
+    Interval index over sprints or versions, spanning dateFrom to
+    dateDone, or dateTo when not done yet. Items without start are only
+    found by name and offset, ones without end are open.
+    """
+
+    def __init__(self, items):
+        # Items in given (timewise sorted) order, offsets count in it
+        self.items = list(items)
+        self.names = {}
+        for item in self.items:
+            if item.name is not None:
+                self.names.setdefault(item.name, item)
+
+        intervals = []
+        for pos, item in enumerate(self.items):
+            if not item.dateFrom:
+                continue
+            end = getattr(item, 'dateDone', None) or item.dateTo or datetime.datetime.max
+            intervals.append((item.dateFrom, end, pos))
+        self.tree = Node(intervals) if intervals else None
+        # Started items by start, for dates between intervals
+        self.latest = sorted((start, pos) for start, end, pos in intervals)
+
+    def _containing(self, date):
+        if not self.tree:
+            return []
+        return sorted(self.tree.containing(date, []))
+
+    def containing(self, date):
+        """
+        Items running at date, in timeline order.
+        """
+        return [self.items[pos] for pos in self._containing(date)]
+
+    def overlapping(self, dateFrom, dateTo):
+        """
+        Items running at any time between dateFrom and dateTo, in
+        timeline order.
+        """
+        if not self.tree:
+            return []
+        return [self.items[pos] for pos in sorted(self.tree.overlapping(dateFrom, dateTo, []))]
+
+    def relative(self, offset, date=None):
+        """
+        Item offset from the one running at date (now by default), or
+        from the last one started before it. Offsets past either end
+        stop at the first or last item.
+        """
+        if not self.items:
+            return None
+
+        date = date or datetime.datetime.now()
+        found = self._containing(date)
+        if found:
+            pos = found[0]
+        else:
+            index = bisect.bisect_right(self.latest, (date, len(self.items))) - 1
+            pos = self.latest[index][1] if index >= 0 else 0
+
+        pos = min(max(pos + offset, 0), len(self.items) - 1)
+        return self.items[pos]
+
+    def named(self, name):
+        """
+        Item of exactly that name, or the first one containing it.
+        """
+        item = self.names.get(name)
+        if item is not None:
+            return item
+        for item in self.items:
+            if item.name and name in item.name:
+                return item
+        return None
@@ -0,0 +1,157 @@
+
+import sys
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+started = time.perf_counter()
+phases = []
+requests = []
+enabled = False
+# Request accounting and JSON trace path, with --profile
+profiling = False
+trace = None
+
+_local = threading.local()
+
+
+def setup(params):
+    global enabled
+    global profiling
+    global trace
+
+    enabled = bool(params.showTiming or params.showProfile)
+    profiling = bool(params.showProfile)
+    trace = params.showProfile if isinstance(params.showProfile, str) else None
+
+
+def reset():
+    global started
+    started = time.perf_counter()
+    del phases[:]
+    del requests[:]
+
+
+def mark(name):
+    """
+    Record phase ending now, started at the previous mark.
+    """
+    now = time.perf_counter()
+    last = phases[-1][2] if phases else started
+    phases.append((name, last, now, 0, threading.get_ident()))
+
+
+@contextmanager
+def phase(name):
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        phases.append((name, begin, time.perf_counter(), depth, threading.get_ident()))
+
+
+def timed(name):
+    """
+    Decorator running function as a named phase.
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def timedFn(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return timedFn
+    return wrap
+
+
+def response(r, *args, **kwargs):
+    """
+    requests response hook, accounts HTTP round trips when profiling.
+    """
+    if not profiling:
+        return
+    now = time.perf_counter()
+    took = r.elapsed.total_seconds()
+    requests.append((urlparse(r.url).path, now - took, now, len(r.content),
+                     r.status_code, threading.get_ident()))
+
+
+@contextmanager
+def profiled(path):
+    """
+    Dump cProfile stats of the block into path, if given.
+    """
+    if not path:
+        yield
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def _traffic(begin, end):
+    # Requests completed while the phase was running, on any thread
+    count, size, latency = 0, 0, 0
+    for path, rbegin, rend, rsize, status, tid in requests:
+        if begin <= rend <= end:
+            count += 1
+            size += rsize
+            latency += rend - rbegin
+    return count, size, latency
+
+
+def _events():
+    events = []
+    for name, begin, end, depth, tid in phases:
+        count, size, latency = _traffic(begin, end)
+        events.append({"name": name, "cat": "phase", "ph": "X", "pid": 1, "tid": tid,
+                       "ts": round((begin - started) * 1e6), "dur": round((end - begin) * 1e6),
+                       "args": {"requests": count, "bytes": size,
+                                "latency_ms": round(latency * 1000, 3)}})
+    for path, begin, end, size, status, tid in requests:
+        events.append({"name": path, "cat": "request", "ph": "X", "pid": 1, "tid": tid,
+                       "ts": round((begin - started) * 1e6), "dur": round((end - begin) * 1e6),
+                       "args": {"bytes": size, "status": status}})
+    return sorted(events, key=lambda event: event["ts"])
+
+
+def report(out=None):
+    if not enabled:
+        return
+
+    if trace:
+        # Chrome trace event format, loads in chrome://tracing or Perfetto
+        with open(trace, "w") as f:
+            json.dump({"traceEvents": _events(), "displayTimeUnit": "ms"}, f)
+        return
+
+    out = out or sys.stderr
+    ordered = sorted(phases, key=lambda phase: phase[1])
+    if not profiling:
+        out.write("%-24s %10s %10s\n" % ("phase", "start ms", "took ms"))
+        for name, begin, end, depth, tid in ordered:
+            out.write("%-24s %10.1f %10.1f\n" % ("  " * depth + name, (begin - started) * 1000, (end - begin) * 1000))
+        out.write("%-24s %10s %10.1f\n" % ("total", "", (time.perf_counter() - started) * 1000))
+        return
+
+    out.write("%-24s %10s %10s %6s %10s %10s\n" % ("phase", "start ms", "took ms", "reqs", "KiB", "net ms"))
+    for name, begin, end, depth, tid in ordered:
+        count, size, latency = _traffic(begin, end)
+        out.write("%-24s %10.1f %10.1f %6u %10.1f %10.1f\n" %
+                  ("  " * depth + name, (begin - started) * 1000, (end - begin) * 1000,
+                   count, size / 1024, latency * 1000))
+    count, size, latency = _traffic(started, time.perf_counter())
+    out.write("%-24s %10s %10.1f %6u %10.1f %10.1f\n" %
+              ("total", "", (time.perf_counter() - started) * 1000, count, size / 1024, latency * 1000))
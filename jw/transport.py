@@ -0,0 +1,192 @@
+
+import time
+import random
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+
+# Statuses retried after backing off, Retry-After is honored when sent
+RETRY_STATUS = (429, 502, 503, 504)
+RETRY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Limiter:
+    """
+    Token bucket shared by all requests to a target. Without configured
+    rate it only starts limiting once the server throttles, then halves
+    the rate on every 429 and creeps back up while requests succeed.
+    """
+
+    def __init__(self, rate=0, burst=None):
+        self.lock = threading.Lock()
+        self.limit = rate
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+        self.paused = 0
+        self.granted = deque(maxlen=64)
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused and (not self.rate or self.tokens >= 1):
+                    if self.rate:
+                        self.tokens -= 1
+                    self.granted.append(now)
+                    return
+                if now < self.paused:
+                    wait = self.paused - now
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def _observed(self, now):
+        # Throughput reached so far, starting point once throttled
+        if len(self.granted) < 2 or now <= self.granted[0]:
+            return 1.0
+        return len(self.granted) / (now - self.granted[0])
+
+    def throttled(self, delay):
+        with self.lock:
+            now = time.monotonic()
+            self.paused = max(self.paused, now + delay)
+            self.rate = max(0.5, (self.rate or self._observed(now)) / 2)
+            self.burst = max(1, min(self.burst, self.rate))
+            self.tokens = min(self.tokens, 0)
+
+    def succeeded(self):
+        with self.lock:
+            if not self.rate or self.rate == self.limit:
+                return
+            # Additive increase, about one request/s per second of traffic
+            self.rate += 1 / self.rate
+            if self.limit and self.rate > self.limit:
+                self.rate = self.limit
+
+    def adapt(self, headers):
+        """
+        Follow rate limit announced by the server, if any.
+        """
+        fill = headers.get("X-RateLimit-FillRate")
+        interval = headers.get("X-RateLimit-Interval-Seconds")
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        nearLimit = headers.get("X-RateLimit-NearLimit")
+        with self.lock:
+            try:
+                if fill and interval:
+                    rate = float(fill) / float(interval)
+                    if not self.limit or rate < self.limit:
+                        self.limit = rate
+                        if not self.rate or self.rate > rate:
+                            self.rate = rate
+                if limit and self.rate:
+                    self.burst = max(1, float(limit))
+                if remaining is not None and self.rate:
+                    self.tokens = min(self.tokens, float(remaining))
+            except ValueError:
+                pass
+            if nearLimit == "true" and self.rate:
+                self.rate = max(0.5, self.rate * 0.8)
+
+
+def _retry_after(headers):
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Adapter(HTTPAdapter):
+    """
+    Pooled keep-alive connections with rate limiting, default timeout
+    and retries with jittered exponential backoff.
+    """
+
+    def __init__(self, limiter, pool_size=10, timeout=30, retries=5, backoff=0.5, backoff_max=30):
+        self.limiter = limiter
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def _delay(self, attempt):
+        # Full jitter keeps concurrent workers from retrying in step
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        retry = request.method in RETRY_METHODS
+
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (ConnectionError, Timeout):
+                if not retry or attempt >= self.retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                attempt += 1
+                continue
+
+            self.limiter.adapt(response.headers)
+            if response.status_code not in RETRY_STATUS:
+                self.limiter.succeeded()
+                return response
+
+            delay = _retry_after(response.headers)
+            if response.status_code == 429:
+                self.limiter.throttled(delay if delay is not None else self._delay(attempt))
+            elif not retry:
+                return response
+            if attempt >= self.retries:
+                return response
+
+            response.close()
+            if response.status_code == 429:
+                # Limiter already holds all requests back, spread restarts
+                time.sleep(random.uniform(0, self.backoff))
+            elif delay is not None:
+                time.sleep(delay + random.uniform(0, self.backoff))
+            else:
+                time.sleep(self._delay(attempt))
+            attempt += 1
+
+
+def mount(session, config, workers):
+    """
+    Install transport on a JIRA client session, configured from target
+    'pool_size', 'timeout', 'rate_limit' and 'retries' settings.
+    """
+    limiter = Limiter(float(config.rate_limit or 0))
+    adapter = Adapter(limiter,
+                      pool_size=int(config.pool_size or max(10, workers)),
+                      timeout=float(config.timeout or 30),
+                      retries=int(config.retries or 5))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.headers["Connection"] = "keep-alive"
+    return adapter
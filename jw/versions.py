@@ -1,10 +1,11 @@
 
 from datetime import datetime
-from termcolor import colored
 from . import fetch as jwfetch
 
 
 def run():
+    from termcolor import colored
+
     versions = jwfetch.jw_versions()
 
     dateNow = datetime.now().replace(tzinfo=None)